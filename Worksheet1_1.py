@@ -1,4 +1,5 @@
 # Defining the Node classes for agents and world with delayed starts
+from instrumentation import count, timed # named timers and counters for profiling the step loop; free unless enabled
 
 class Agent: # Agent class is created, Agent name, position and behavior is initiated
     def __init__(self, name, position, movement_behavior):
@@ -23,6 +24,7 @@ class GridWorld: # Agent gridworld is created
         self.start_delays = start_delays
         self.current_step = 0
     
+    @timed("gridworld.update_world")
     def update_world(self): #Updated the agent positions
         messages = []
         occupied_positions = [agent.position for agent in self.agents if self.current_step >= self.start_delays[self.agents.index(agent)]]
@@ -33,12 +35,15 @@ class GridWorld: # Agent gridworld is created
             elif self.current_step >= self.start_delays[i]:
                 move_message = agent.move(self.size, occupied_positions)
                 messages.append(move_message)
+                count("agent.move")
                 # Update occupied positions after move
+                count("gridworld.occupied_positions")
                 occupied_positions = [agent.position for agent in self.agents if self.current_step >= self.start_delays[self.agents.index(agent)]]
         
         self.current_step += 1
         return messages
     
+    @timed("render")
     def display(self): # Displays the world, agent and the moves each agent has made
         grid_repr = ""
         for i in range(self.size):
@@ -86,24 +91,29 @@ def move_left(position, grid_size): # Moves the agent L to the left
     return (x % grid_size, y % grid_size)
 
 
-# Initialize agents with their movement behaviors and starting positions
-starting_positions = [(1, 0), (1, 0), (1, 0)]  # All agents start at (2x1)
-agent_clockwise = Agent("C", starting_positions[0], move_clockwise)
-agent_diagonal = Agent("D", starting_positions[1], move_counterclockwise_diagonal)
-agent_left = Agent("L", starting_positions[2], move_left)
+def main(): # Runs the 50-step demonstration with staggered starts
+    # Initialize agents with their movement behaviors and starting positions
+    starting_positions = [(1, 0), (1, 0), (1, 0)]  # All agents start at (2x1)
+    agent_clockwise = Agent("C", starting_positions[0], move_clockwise)
+    agent_diagonal = Agent("D", starting_positions[1], move_counterclockwise_diagonal)
+    agent_left = Agent("L", starting_positions[2], move_left)
 
-# Define delays: C appears on step 1, D on step 3, L on step 5
-agents = [agent_clockwise, agent_diagonal, agent_left]
-start_delays = [0, 2, 4]  # 2-step delay for D and 4-step delay for L
+    # Define delays: C appears on step 1, D on step 3, L on step 5
+    agents = [agent_clockwise, agent_diagonal, agent_left]
+    start_delays = [0, 2, 4]  # 2-step delay for D and 4-step delay for L
 
-# Create the grid world with delayed starts and same starting position
-grid_world = GridWorld(3, agents, start_delays)
+    # Create the grid world with delayed starts and same starting position
+    grid_world = GridWorld(3, agents, start_delays)
 
-# Simulate and display 50 steps in the grid world to observe the staggered starts and behavior
-for step in range(50):
-    print(f"Step {step + 1}:")
-    messages = grid_world.update_world()
-    grid_world.display()
-    for message in messages:
-        print(message)
-    print("\n")
+    # Simulate and display 50 steps in the grid world to observe the staggered starts and behavior
+    for step in range(50):
+        print(f"Step {step + 1}:")
+        messages = grid_world.update_world()
+        grid_world.display()
+        for message in messages:
+            print(message)
+        print("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-import random # importing random libraty to modify agent spawning to random positions for each episode
+import numpy as np # numpy random Generator is used to spawn agents at random positions for each episode
+from instrumentation import count, phase, timed # named timers and counters for profiling the step loop; free unless enabled
 
 class Agent: # Agent class is created, Agent name, position and behavior is initiated
     def __init__(self, name, position, movement_behavior):
@@ -35,6 +36,7 @@ class GridWorld: # Agent gridworld is created
         self.start_delays = start_delays
         self.current_step = 0
     
+    @timed("gridworld.update_world")
     def update_world(self): # Updated the agent positions
         messages = []
         occupied_positions = [agent.position for agent in self.agents if agent.in_game]
@@ -43,7 +45,9 @@ class GridWorld: # Agent gridworld is created
             if self.current_step >= self.start_delays[i] and agent.in_game:
                 move_message = agent.move(self.size, occupied_positions)
                 messages.append(move_message)
+                count("agent.move")
                 # Update occupied positions after move
+                count("gridworld.occupied_positions")
                 occupied_positions = [agent.position for agent in self.agents if agent.in_game]
         
         self.current_step += 1
@@ -91,13 +95,10 @@ def move_up(position, grid_size): # Moves the agent U always up.
 
 
 # Initialize agents with their movement behaviors and starting positions
-def create_agents_random(grid_size=5): # Creates the agents with random starting positions and movement behaviors.
-    start_positions = set()  # To avoid duplicate starting positions
-    
-    while len(start_positions) < 4:
-        start_positions.add((random.randint(0, grid_size - 1), random.randint(0, grid_size - 1)))
-    
-    start_positions = list(start_positions) 
+def create_agents_random(grid_size=5, rng=None): # Creates the agents with random starting positions and movement behaviors.
+    rng = np.random.default_rng(rng)  # Generator, seed or None
+    cells = rng.choice(grid_size * grid_size, size=4, replace=False)  # Drawn without replacement to avoid duplicate starting positions
+    start_positions = [divmod(int(cell), grid_size) for cell in cells]
     
     agent_clockwise = Agent("C", start_positions[0], move_clockwise)
     agent_diagonal = Agent("D", start_positions[1], move_counterclockwise_diagonal)
@@ -109,34 +110,41 @@ def create_agents_random(grid_size=5): # Creates the agents with random starting
 
 
 # Simulate the grid world with random starting positions for 100 steps
-def simulate_world_with_random_start(grid_size=5, num_steps=100):
-    agents = create_agents_random(grid_size)
+def simulate_world_with_random_start(grid_size=5, num_steps=100, rng=None):
+    agents = create_agents_random(grid_size, rng)
     grid_world = GridWorld(grid_size, agents, [0, 0, 0, 0])  # All agents start immediately
 
     for step in range(num_steps):
         print(f"Step {step + 1}:")
         messages = grid_world.update_world()
-        for message in messages:
-            print(message)
-        print("\n")
+        with phase("print"):
+            for message in messages:
+                print(message)
+            print("\n")
 
     return grid_world.count_active_agents()
 
-# Run the simulations with random start states
-print("Simulation 1:")
-agents_remaining_1 = simulate_world_with_random_start()
-print(f"Agents remaining after 100 steps: {agents_remaining_1}\n")
+def main(): # Runs three simulations with random start states and prints the results
+    # Run the simulations with random start states, all drawing from one generator
+    rng = np.random.default_rng()
+    print("Simulation 1:")
+    agents_remaining_1 = simulate_world_with_random_start(rng=rng)
+    print(f"Agents remaining after 100 steps: {agents_remaining_1}\n")
+
+    print("Simulation 2:")
+    agents_remaining_2 = simulate_world_with_random_start(rng=rng)
+    print(f"Agents remaining after 100 steps: {agents_remaining_2}\n")
+
+    print("Simulation 3:")
+    agents_remaining_3 = simulate_world_with_random_start(rng=rng)
+    print(f"Agents remaining after 100 steps: {agents_remaining_3}\n")
 
-print("Simulation 2:")
-agents_remaining_2 = simulate_world_with_random_start()
-print(f"Agents remaining after 100 steps: {agents_remaining_2}\n")
+    # Print final results
+    print(f"Results after 100 time-steps for all simulations:")
+    print(f"Simulation 1: {agents_remaining_1} agents remained")
+    print(f"Simulation 2: {agents_remaining_2} agents remained")
+    print(f"Simulation 3: {agents_remaining_3} agents remained")
 
-print("Simulation 3:")
-agents_remaining_3 = simulate_world_with_random_start()
-print(f"Agents remaining after 100 steps: {agents_remaining_3}\n")
 
-# Print final results
-print(f"Results after 100 time-steps for all simulations:")
-print(f"Simulation 1: {agents_remaining_1} agents remained")
-print(f"Simulation 2: {agents_remaining_2} agents remained")
-print(f"Simulation 3: {agents_remaining_3} agents remained")
+if __name__ == "__main__":
+    main()
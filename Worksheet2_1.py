@@ -1,5 +1,4 @@
-import tkinter as tk # tkinter library is imported for a visual demostation of the simulation
-import random # random library is imported to implement random movements of the angents
+import numpy as np # numpy random Generator is used to implement random movements of the angents
 
 class Agent: # initiating the agent class
     def __init__(self, x, y, vx, vy):
@@ -20,13 +19,14 @@ class Agent: # initiating the agent class
         return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** 0.5
 
 class World: #initiating the world class
-    def __init__(self, num_agents):
+    def __init__(self, num_agents, rng=None):
+        self.rng = np.random.default_rng(rng)  # Generator, seed or None; every random draw of the run comes from it
         self.agents = [self.create_random_agent() for _ in range(num_agents)]
         self.lead_agent = self.agents[0]
 
     def create_random_agent(self): # Initialize an agent with random position and velocity.
-        x, y = random.uniform(-50, 50), random.uniform(-50, 50)
-        vx, vy = random.uniform(-1, 1), random.uniform(-1, 1)
+        x, y = self.rng.uniform(-50, 50, 2).tolist()
+        vx, vy = self.rng.uniform(-1, 1, 2).tolist()
         return Agent(x, y, vx, vy)
 
     def move_agents(self): # Move all agents based on their velocities.
@@ -34,7 +34,7 @@ class World: #initiating the world class
             agent.move()
 
     def update_lead_velocity(self): # Change the lead agent's velocity randomly.
-        self.lead_agent.update_velocity(random.uniform(-1, 1), random.uniform(-1, 1))
+        self.lead_agent.update_velocity(*self.rng.uniform(-1, 1, 2).tolist())
 
     def update_other_agents_velocity(self): # Update velocity of all agents based on their position relative to the lead agent.
         for agent in self.agents:
@@ -53,6 +53,8 @@ class World: #initiating the world class
 
 class SimulationApp: # makes a canver using tkinter
     def __init__(self, root, world):
+        import tkinter as tk # tkinter is only imported for the visual demonstration, so World works without a display
+
         self.root = root
         self.world = world
         self.step_count = 1
@@ -114,6 +116,8 @@ class SimulationApp: # makes a canver using tkinter
 if __name__ == "__main__":
     world = World(num_agents=10)
 
+    import tkinter as tk
+
     root = tk.Tk()
     root.title("Agent Simulation")
     app = SimulationApp(root, world)
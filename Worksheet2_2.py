@@ -47,11 +47,16 @@ def gradient_descent(initial_x, alpha, theta, max_iterations=1000):
     print("Did not converge within the maximum number of iterations.")
     return x
 
-# Parameters
-initial_x = 10  # Starting point for x
-alpha = 0.1     # Learning rate
-theta = 0.001   # Convergence threshold
+def main(): # Runs gradient descent on f(x) = 3x^2 from x = 10
+    # Parameters
+    initial_x = 10  # Starting point for x
+    alpha = 0.1     # Learning rate
+    theta = 0.001   # Convergence threshold
 
-# Run the gradient descent
-print("Running Gradient Descent for f(x) = 3x^2")
-final_x = gradient_descent(initial_x, alpha, theta)
+    # Run the gradient descent
+    print("Running Gradient Descent for f(x) = 3x^2")
+    final_x = gradient_descent(initial_x, alpha, theta)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
-import time
+
+from instrumentation import count, phase, timed
 
 # Define the TreasureHunter class with Bayesian Updating capability
 class TreasureHunter:
-    def __init__(self, n_locations=10):
+    def __init__(self, n_locations=10, rng=None):
         self.n_locations = n_locations
+        self.rng = np.random.default_rng(rng)  # Generator, seed or None
         self.beliefs = np.full(n_locations, 1 / n_locations)
 
     def reset(self):
@@ -15,7 +15,7 @@ class TreasureHunter:
     def where_to_go(self):
         max_belief = np.max(self.beliefs)
         candidates = np.where(self.beliefs == max_belief)[0]
-        chosen_location = random.choice(candidates)
+        chosen_location = self.rng.choice(candidates)
         return chosen_location
 
     def update_location_empty(self, location):
@@ -26,6 +26,7 @@ class TreasureHunter:
 
     def social_bayesian_update(self, observed_location, p_a_given_t=0.18):
         # Bayesian update based on another hunter's observed action
+        count("social_bayesian_update")
         p_a_given_not_t = (1 - p_a_given_t) / (self.n_locations - 1)
         
         # Updating probabilities using Bayes' rule
@@ -40,20 +41,23 @@ class TreasureHunter:
 
 # Define the MultiAgentWorld class
 class MultiAgentWorld:
-    def __init__(self, n_locations=10, k_hunters=10, n_turns=100):
+    def __init__(self, n_locations=10, k_hunters=10, n_turns=100, rng=None):
         self.n_locations = n_locations
         self.k_hunters = k_hunters
         self.n_turns = n_turns
-        self.treasure_location = random.randint(0, n_locations - 1)
-        self.hunters = [TreasureHunter(n_locations) for _ in range(k_hunters)]
+        self.rng = np.random.default_rng(rng)  # One generator for the run, shared with the hunters
+        self.treasure_location = int(self.rng.integers(n_locations))
+        self.hunters = [TreasureHunter(n_locations, rng=self.rng) for _ in range(k_hunters)]
         self.findings_with_update = 0
         self.findings_without_update = 0
 
+    @timed("world.run_simulation")
     def run_simulation(self, social_update=True):
         for turn in range(self.n_turns):
             hunter_index = turn % self.k_hunters  # Determine which hunter's turn it is
             current_hunter = self.hunters[hunter_index]
             location = current_hunter.where_to_go()
+            count("world.turns")
 
             # Check if the current hunter finds the treasure
             if location == self.treasure_location:
@@ -67,9 +71,10 @@ class MultiAgentWorld:
 
             # Social Bayesian Update for other hunters if enabled
             if social_update:
-                for i, hunter in enumerate(self.hunters):
-                    if i != hunter_index:
-                        hunter.social_bayesian_update(location)
+                with phase("world.social_update"):
+                    for i, hunter in enumerate(self.hunters):
+                        if i != hunter_index:
+                            hunter.social_bayesian_update(location)
 
     def run_comparison(self):
         # Run simulation with social Bayesian updates
@@ -78,16 +83,21 @@ class MultiAgentWorld:
         
         # Reset counts and hunters, run simulation without social Bayesian updates
         self.findings_with_update = 0
-        self.hunters = [TreasureHunter(self.n_locations) for _ in range(self.k_hunters)]
+        self.hunters = [TreasureHunter(self.n_locations, rng=self.rng) for _ in range(self.k_hunters)]
         self.run_simulation(social_update=False)
         without_update_results = self.findings_without_update
         
         return with_update_results, without_update_results
 
-# Run the multi-agent world simulation and compare findings
-world = MultiAgentWorld(n_locations=10, k_hunters=10, n_turns=1000)
-with_update, without_update = world.run_comparison()
+def main():
+    # Run the multi-agent world simulation and compare findings
+    world = MultiAgentWorld(n_locations=10, k_hunters=10, n_turns=1000)
+    with_update, without_update = world.run_comparison()
+
+    # Display results
+    print(f"Findings with Social Bayesian Update: {with_update}")
+    print(f"Findings without Social Bayesian Update: {without_update}")
+
 
-# Display results
-print(f"Findings with Social Bayesian Update: {with_update}")
-print(f"Findings without Social Bayesian Update: {without_update}")
+if __name__ == "__main__":
+    main()
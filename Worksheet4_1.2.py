@@ -1,20 +1,23 @@
-import random
 import time
 import itertools
 import numpy as np
 
+from seeding import generator, takes_rng
+
 class Agent:
-    def __init__(self, name, position, behaviour):
+    def __init__(self, name, position, behaviour, rng=None):
         self.name = name
         self.position = position
         self.behaviour = behaviour
         self.history = []  # Track recent positions
+        self.rng = generator(rng)  # Drives exploration and tie-breaking
+        self.policy_kwargs = {'rng': self.rng} if takes_rng(behaviour) else {}
 
     def move(self, grid_size, occupied_positions):
         if self.behaviour == "annoying":
             return None
         else:
-            new_position, action_taken = self.behaviour(self.position, grid_size, occupied_positions, self.history)
+            new_position, action_taken = self.behaviour(self.position, grid_size, occupied_positions, self.history, **self.policy_kwargs)
             # Update history
             self.history.append(self.position)
             if len(self.history) > 10:  # Increase history length
@@ -98,9 +101,10 @@ def calculate_empowerment(start_position, grid_size, occupied_positions):
     return np.log2(len(reachable_states)) if reachable_states else 0
 
 # Define VIP agent's behavior with exploration strategy
-def vip_empowerment_policy(position, grid_size, occupied_positions, agent_history):
+def vip_empowerment_policy(position, grid_size, occupied_positions, agent_history, rng=None):
+    rng = generator(rng)
     epsilon = 0.1  # Exploration rate (10% chance to explore)
-    if random.random() < epsilon:
+    if rng.random() < epsilon:
         # Exploration: choose a random valid move
         possible_moves = []
         for action in actions.keys():
@@ -108,7 +112,7 @@ def vip_empowerment_policy(position, grid_size, occupied_positions, agent_histor
             if new_position != position:
                 possible_moves.append((new_position, action))
         if possible_moves:
-            chosen_move = random.choice(possible_moves)
+            chosen_move = possible_moves[rng.integers(len(possible_moves))]
             return chosen_move
         else:
             # No valid moves, stay in place
@@ -129,41 +133,34 @@ def vip_empowerment_policy(position, grid_size, occupied_positions, agent_histor
             elif empowerment == max_empowerment:
                 best_moves.append((new_position, action))
         if best_moves:
-            chosen_move = random.choice(best_moves)
+            chosen_move = best_moves[rng.integers(len(best_moves))]
             return chosen_move
         else:
             # If all moves are equally bad, stay in place
             return (position, "stays")
 
-# Create a 5x5 world with 5 annoying agents and 1 VIP agent
-grid_size = 5
-agent_positions = set()
-
-# Initialize 5 annoying agents
-annoying_agents = []
-for i in range(5):
-    while True:
-        position = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-        if position not in agent_positions:
-            agent_positions.add(position)
-            annoying_agents.append(Agent(name="A", position=position, behaviour="annoying"))
-            break
-
-# Initialize the VIP agent
-while True:
-    position = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-    if position not in agent_positions:
-        agent_positions.add(position)
-        vip_agent = Agent(name="V", position=position, behaviour=vip_empowerment_policy)
-        break
-
-# Add all agents to the grid world
-agents = annoying_agents + [vip_agent]
-world = GridWorld(size=grid_size, agents=agents)
-
-# Run the world updates for 50 steps and display the grid state
-for step in range(500):
-    print(f"\nStep {step + 1}")
-    world.update_world()
-    world.display_grid()
-    time.sleep(0.025)
+def main(rng=None):
+    # Create a 5x5 world with 5 annoying agents and 1 VIP agent
+    grid_size = 5
+    rng = generator(rng)
+
+    # Draw 6 distinct cells at once: 5 annoying agents, then the VIP agent
+    cells = rng.choice(grid_size * grid_size, size=6, replace=False)
+    positions = [divmod(int(cell), grid_size) for cell in cells]
+    annoying_agents = [Agent(name="A", position=position, behaviour="annoying") for position in positions[:5]]
+    vip_agent = Agent(name="V", position=positions[5], behaviour=vip_empowerment_policy, rng=rng)
+
+    # Add all agents to the grid world
+    agents = annoying_agents + [vip_agent]
+    world = GridWorld(size=grid_size, agents=agents)
+
+    # Run the world updates for 50 steps and display the grid state
+    for step in range(500):
+        print(f"\nStep {step + 1}")
+        world.update_world()
+        world.display_grid()
+        time.sleep(0.025)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
-import random
 import time
 import itertools
 import numpy as np
 
+from instrumentation import count, phase, timed
+from seeding import generator, takes_rng
+
 # Define the Agent class
 class Agent:
-    def __init__(self, name, position, behavior):
+    def __init__(self, name, position, behavior, rng=None):
         self.name = name
         self.position = position
         self.behavior = behavior  # Can be "annoying" or a movement function
+        self.rng = generator(rng)  # Breaks ties between equally good moves
+        self.policy_kwargs = {'rng': self.rng} if takes_rng(behavior) else {}
 
     def move(self, grid_size, occupied_positions):
         if self.behavior == "annoying":
@@ -16,7 +20,8 @@ class Agent:
             return None
         else:
             # VIP agent decides on a move based on its policy
-            new_position, action_taken = self.behavior(self.position, grid_size, occupied_positions)
+            with phase("agent.policy"):
+                new_position, action_taken = self.behavior(self.position, grid_size, occupied_positions, **self.policy_kwargs)
             move_message = f"{self.name} moves {action_taken} to {new_position[0] + 1}x{new_position[1] + 1}"
 
             # Check for walls
@@ -43,6 +48,7 @@ class GridWorld:
         # Get positions occupied by annoying agents
         return {agent.position for agent in self.agents if agent.behavior == "annoying"}
 
+    @timed("gridworld.update_world")
     def update_world(self):
         occupied_positions = self.get_occupied_positions()
         for agent in self.agents:
@@ -52,9 +58,11 @@ class GridWorld:
                 if move_result:
                     print(move_result)
                 # Calculate and display empowerment after the move
-                empowerment = calculate_empowerment(agent.position, self.size, occupied_positions)
+                with phase("gridworld.vip_empowerment"):
+                    empowerment = calculate_empowerment(agent.position, self.size, occupied_positions)
                 print(f"3-step empowerment for {agent.name} at position {agent.position[0] + 1}x{agent.position[1] + 1}: {empowerment:.2f}")
 
+    @timed("render")
     def display_grid(self):
         # Initialize an empty grid
         grid = [[" " for _ in range(self.size)] for _ in range(self.size)]
@@ -96,6 +104,7 @@ def simulate_sequence(start_position, sequence, grid_size, occupied_positions):
 
 # Function to calculate empowerment
 def calculate_empowerment(position, grid_size, occupied_positions):
+    count("calculate_empowerment")
     reachable_positions = set()
     for sequence in action_sequences:
         final_position = simulate_sequence(position, sequence, grid_size, occupied_positions)
@@ -104,7 +113,7 @@ def calculate_empowerment(position, grid_size, occupied_positions):
     return np.log2(len(reachable_positions)) if reachable_positions else 0
 
 # Empowerment-driven movement policy for the VIP agent
-def vip_empowerment_policy(position, grid_size, occupied_positions):
+def vip_empowerment_policy(position, grid_size, occupied_positions, rng=None):
     max_empowerment = -1
     best_moves = []
 
@@ -127,31 +136,20 @@ def vip_empowerment_policy(position, grid_size, occupied_positions):
         elif empowerment == max_empowerment:
             best_moves.append((new_position, action))
     # Randomly choose among the best moves
-    chosen_move = random.choice(best_moves)
+    rng = generator(rng)
+    chosen_move = best_moves[rng.integers(len(best_moves))]
     return chosen_move
 
 # Initialize the grid and agents
-def initialize_world():
+def initialize_world(rng=None):
     grid_size = 5
-    agent_positions = set()
-
-    # Initialize 5 annoying agents at random positions
-    annoying_agents = []
-    for _ in range(5):
-        while True:
-            pos = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-            if pos not in agent_positions:
-                agent_positions.add(pos)
-                annoying_agents.append(Agent(name="A", position=pos, behavior="annoying"))
-                break
-
-    # Initialize the VIP agent at a random position
-    while True:
-        pos = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-        if pos not in agent_positions:
-            agent_positions.add(pos)
-            vip_agent = Agent(name="V", position=pos, behavior=vip_empowerment_policy)
-            break
+    rng = generator(rng)
+
+    # Draw 6 distinct cells at once: 5 annoying agents, then the VIP agent
+    cells = rng.choice(grid_size * grid_size, size=6, replace=False)
+    positions = [divmod(int(cell), grid_size) for cell in cells]
+    annoying_agents = [Agent(name="A", position=pos, behavior="annoying") for pos in positions[:5]]
+    vip_agent = Agent(name="V", position=positions[5], behavior=vip_empowerment_policy, rng=rng)
 
     # Create the grid world with all agents
     agents = annoying_agents + [vip_agent]
@@ -159,8 +157,8 @@ def initialize_world():
     return world
 
 # Run the simulation
-def run_simulation(steps=50, delay=0.25):
-    world = initialize_world()
+def run_simulation(steps=50, delay=0.25, rng=None):
+    world = initialize_world(rng)
     for step in range(steps):
         print(f"\nStep {step + 1}")
         world.update_world()
@@ -1,8 +1,10 @@
-import random
 import time
 import itertools
 import numpy as np
 
+from instrumentation import count, phase, timed
+from seeding import generator, takes_rng
+
 # Define possible actions and their effects on position
 ACTIONS = {
     "north": (-1, 0),  # Move up
@@ -15,17 +17,20 @@ ACTIONS = {
 ACTION_SEQUENCES = list(itertools.product(ACTIONS.keys(), repeat=3))
 
 class Agent:
-    def __init__(self, name, position, behavior):
+    def __init__(self, name, position, behavior, rng=None):
         self.name = name                # Agent's name (e.g., "V" for VIP, "A1" for annoying agent 1)
         self.position = position        # Agent's current position on the grid as (row, column)
         self.behavior = behavior        # Function defining the agent's movement policy
+        self.rng = generator(rng)  # Breaks ties between equally good moves
+        self.policy_kwargs = {'rng': self.rng} if takes_rng(behavior) else {}
 
     def move(self, grid_size, agents_positions):
         # Positions occupied by other agents
         occupied_positions = {pos for agent_name, pos in agents_positions.items() if agent_name != self.name}
 
         # Decide on a move based on the agent's behavior
-        intended_position, action_taken = self.behavior(self.position, grid_size, occupied_positions, agents_positions)
+        with phase("agent.policy"):
+            intended_position, action_taken = self.behavior(self.position, grid_size, occupied_positions, agents_positions, **self.policy_kwargs)
 
         # Check if the intended move is within grid bounds
         if not (0 <= intended_position[0] < grid_size and 0 <= intended_position[1] < grid_size):
@@ -53,6 +58,7 @@ class GridWorld:
         # Returns a dictionary of agent names to their positions
         return {agent.name: agent.position for agent in self.agents}
 
+    @timed("gridworld.update_world")
     def update_world(self):
         agents_positions = self.get_agents_positions()
 
@@ -65,9 +71,11 @@ class GridWorld:
             if agent.name == "V":
                 # Calculate and display empowerment for the VIP agent
                 other_agents_positions = {pos for name, pos in agents_positions.items() if name != "V"}
-                empowerment = calculate_empowerment(agent.position, self.size, other_agents_positions)
+                with phase("gridworld.vip_empowerment"):
+                    empowerment = calculate_empowerment(agent.position, self.size, other_agents_positions)
                 print(f"3-step empowerment for {agent.name} at position {agent.position[0]+1}x{agent.position[1]+1}: {empowerment:.2f}")
 
+    @timed("render")
     def display_grid(self):
         # Create an empty grid
         grid = [["  " for _ in range(self.size)] for _ in range(self.size)]
@@ -100,6 +108,7 @@ def simulate_sequence(start_position, sequence, grid_size, occupied_positions):
 
 def calculate_empowerment(position, grid_size, occupied_positions):
     """Calculates the empowerment value from a given position."""
+    count("calculate_empowerment")
     reachable_positions = set()
     for sequence in ACTION_SEQUENCES:
         final_position = simulate_sequence(position, sequence, grid_size, occupied_positions)
@@ -107,7 +116,7 @@ def calculate_empowerment(position, grid_size, occupied_positions):
     # Empowerment is the log base 2 of the number of unique reachable positions
     return np.log2(len(reachable_positions)) if reachable_positions else 0
 
-def vip_empowerment_policy(position, grid_size, occupied_positions, agents_positions):
+def vip_empowerment_policy(position, grid_size, occupied_positions, agents_positions, rng=None):
     """Determines the VIP agent's next move to maximize empowerment."""
     max_empowerment = -1
     best_moves = []
@@ -131,9 +140,10 @@ def vip_empowerment_policy(position, grid_size, occupied_positions, agents_posit
             best_moves.append((intended_position, action))
 
     # Randomly choose among the best moves
-    return random.choice(best_moves)
+    rng = generator(rng)
+    return best_moves[rng.integers(len(best_moves))]
 
-def antagonistic_policy(position, grid_size, occupied_positions, agents_positions):
+def antagonistic_policy(position, grid_size, occupied_positions, agents_positions, rng=None):
     """Determines an annoying agent's next move to minimize the VIP agent's empowerment."""
     min_empowerment = float('inf')
     best_moves = []
@@ -161,40 +171,28 @@ def antagonistic_policy(position, grid_size, occupied_positions, agents_position
             best_moves.append((intended_position, action))
 
     # Randomly choose among the best moves
-    return random.choice(best_moves)
+    rng = generator(rng)
+    return best_moves[rng.integers(len(best_moves))]
 
-def initialize_world():
-    """Initializes the grid world with agents placed randomly."""
+def initialize_world(rng=None):
+    """Initializes the grid world with agents placed randomly; all agents share one generator."""
     grid_size = 5
-    agent_positions = set()
-
-    # Initialize the VIP agent at a random position
-    while True:
-        vip_pos = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-        if vip_pos not in agent_positions:
-            agent_positions.add(vip_pos)
-            vip_agent = Agent(name="V", position=vip_pos, behavior=vip_empowerment_policy)
-            break
-
-    # Initialize 5 annoying agents at random positions
-    annoying_agents = []
-    for i in range(5):
-        while True:
-            agent_pos = (random.randint(0, grid_size - 1), random.randint(0, grid_size - 1))
-            if agent_pos not in agent_positions:
-                agent_positions.add(agent_pos)
-                agent_name = f"A{i+1}"
-                annoying_agent = Agent(name=agent_name, position=agent_pos, behavior=antagonistic_policy)
-                annoying_agents.append(annoying_agent)
-                break
+    rng = generator(rng)
+
+    # Draw 6 distinct cells at once: the VIP agent, then 5 annoying agents
+    cells = rng.choice(grid_size * grid_size, size=6, replace=False)
+    positions = [divmod(int(cell), grid_size) for cell in cells]
+    vip_agent = Agent(name="V", position=positions[0], behavior=vip_empowerment_policy, rng=rng)
+    annoying_agents = [Agent(name=f"A{i+1}", position=pos, behavior=antagonistic_policy, rng=rng)
+                       for i, pos in enumerate(positions[1:])]
 
     # Create the grid world with all agents
     agents = [vip_agent] + annoying_agents  # VIP agent moves first
     return GridWorld(size=grid_size, agents=agents)
 
-def run_simulation(steps=30, delay=0.25):
+def run_simulation(steps=30, delay=0.25, rng=None):
     """Runs the simulation for a specified number of steps."""
-    world = initialize_world()
+    world = initialize_world(rng)
     for step in range(steps):
         print(f"\nStep {step + 1}")
         world.update_world()
@@ -1,10 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
+
+from instrumentation import count, phase, timed
 
 class Sugarscape:
-    def __init__(self, size=10, num_agents=20):
+    def __init__(self, size=10, num_agents=20, rng=None):
         self.size = size
+        self.rng = np.random.default_rng(rng)  # Generator, seed or None
         self.grid = np.zeros((size, size), dtype=int)  # Sugar levels grid
         self.agents = []  # List to hold agents
         self.initialize_sugar_levels()
@@ -14,23 +15,20 @@ class Sugarscape:
         """
         Populate the grid with sugar levels randomly between 1 and 4 for each cell.
         """
-        for row in range(self.size):
-            for col in range(self.size):
-                self.grid[row, col] = random.randint(1, 4)
+        self.grid[:] = self.rng.integers(1, 5, size=(self.size, self.size))
 
     def place_agents(self, num_agents):
         """
         Place agents at random positions on the grid, ensuring no two agents start at the same cell.
         """
-        for _ in range(num_agents):
-            while True:
-                row, col = random.randint(0, self.size - 1), random.randint(0, self.size - 1)
-                # Ensure no two agents start in the same cell
-                if not any(agent.row == row and agent.col == col for agent in self.agents):
-                    metabolism = random.randint(1, 3)  # Random metabolism rate
-                    self.agents.append(Agent(row, col, metabolism))
-                    break
+        # Drawing distinct cells without replacement ensures no two agents start in the same cell
+        cells = self.rng.choice(self.size * self.size, size=num_agents, replace=False)
+        metabolisms = self.rng.integers(1, 4, size=num_agents)  # Random metabolism rates
+        for cell, metabolism in zip(cells.tolist(), metabolisms.tolist()):
+            row, col = divmod(cell, self.size)
+            self.agents.append(Agent(row, col, metabolism))
 
+    @timed("sugarscape.update_world")
     def update_world(self):
         """
         Advance the simulation by one step, where each agent moves, consumes sugar, and metabolizes.
@@ -40,16 +38,20 @@ class Sugarscape:
                 agent.find_and_move_to_sugar(self)
                 agent.consume_sugar(self)
                 agent.process_metabolism()
+                count("sugarscape.agent_updates")
 
     def run_simulation(self, steps=20):
         """
         Run the Sugarscape simulation for a set number of steps and display each step on a grid.
         """
+        import matplotlib.pyplot as plt
+
         fig, axes = plt.subplots(4, 5, figsize=(15, 12))  # 4x5 grid of subplots
         axes = axes.flatten()
         
         for step in range(steps):
-            self.display_grid(axes[step], step)
+            with phase("render"):
+                self.display_grid(axes[step], step)
             self.update_world()
         
         plt.tight_layout()
@@ -120,6 +122,11 @@ class Agent:
         if self.sugar <= 0:
             self.alive = False
 
-# Run the Sugarscape simulation
-sugarscape = Sugarscape(size=10, num_agents=20)
-sugarscape.run_simulation(steps=20)
+def main():
+    # Run the Sugarscape simulation
+    sugarscape = Sugarscape(size=10, num_agents=20)
+    sugarscape.run_simulation(steps=20)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,55 @@
 import numpy as np
-import random
 import time
+from collections import Counter, deque
+
+# Row/column offsets for each direction, as Ant.move applies them
+DIRECTIONS = ["north", "south", "east", "west"]
+DIRECTION_OFFSETS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
 
 class Ant:
-    def __init__(self, position):
+    def __init__(self, position, rows=4, cols=6):
         self.position = position
+        self.rows = rows
+        self.cols = cols
 
     def move(self, direction):
         # Move ant based on the given direction
         row, col = self.position
         if direction == "north" and row > 0:
             self.position = (row - 1, col)
-        elif direction == "south" and row < 3:
+        elif direction == "south" and row < self.rows - 1:
             self.position = (row + 1, col)
         elif direction == "east" and col > 0:
             self.position = (row, col - 1)
-        elif direction == "west" and col < 5:
+        elif direction == "west" and col < self.cols - 1:
             self.position = (row, col + 1)
 
 class GridWorld:
-    def __init__(self, pheromons):
-        self.grid = np.full((4, 6), "")
-        self.food = [(3, 5), (3, 0)]
-        self.grid[0, 0] = "H"
-        self.ant = Ant((0, 0))
-        self.pheromon_list = []
+    def __init__(self, pheromons, rows=4, cols=6, home=(0, 0), food=None, verbose=True, delay=0.17):
+        self.grid = np.full((rows, cols), "")
+        self.home = home
+        self.food = list(food) if food is not None else [(rows - 1, cols - 1), (rows - 1, 0)]
+        self.grid[home] = "H"
+        self.ant = Ant(home, rows, cols)
+        self.verbose = verbose  # Print messages and the grid while the ant moves
+        self.delay = delay  # Seconds to pause after each displayed step
+        # Ring buffer of the trail (oldest first) plus a count per cell, so adding,
+        # evicting and "is there pheromone here" are all O(1)
+        self.pheromon_list = deque()
+        self.pheromon_counts = Counter()
         self.MaxPheromons = pheromons
 
     def leave_pheromon(self, position):
         self.pheromon_list.append(position)
+        self.pheromon_counts[position] += 1
         if len(self.pheromon_list) > self.MaxPheromons:
-            del self.pheromon_list[0]
+            oldest = self.pheromon_list.popleft()
+            self.pheromon_counts[oldest] -= 1
+            if not self.pheromon_counts[oldest]:
+                del self.pheromon_counts[oldest]
+
+    def has_pheromon(self, position):
+        return position in self.pheromon_counts
 
     def move_ant(self, direction): # Move the ant in the specified direction
         self.ant.move(direction)
@@ -38,22 +57,30 @@ class GridWorld:
 
     def find_food(self):
         if self.ant.position in self.food:
-            print("Found food!!!")
+            self.log("Found food!!!")
             return True
         return False
 
     def go_home(self): # Move the ant back home by following the pheromone trail in reverse
-        print("Returning home...")
+        self.log("Returning home...")
         for position in reversed(self.pheromon_list):
             self.ant.position = position
-            self.display_grid()
-            time.sleep(0.17)
-            if self.ant.position == (0, 0):  # Check if ant has reached home
-                print("Ant has returned home.")
+            self.show()
+            if self.ant.position == self.home:  # Check if ant has reached home
+                self.log("Ant has returned home.")
                 return True
-        print("Ant ran out of pheromones while returning home.")
+        self.log("Ant ran out of pheromones while returning home.")
         return False
 
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def show(self): # Display the grid and pause, unless running quietly
+        if self.verbose:
+            self.display_grid()
+            time.sleep(self.delay)
+
     def display_grid(self): # Display the grid with the ant's position marked as "A"
         for r in range(self.grid.shape[0]):
             row_display = []
@@ -62,7 +89,7 @@ class GridWorld:
                     row_display.append(" A ")
                 elif (r, c) in self.food:
                     row_display.append(" F ")
-                elif (r, c) in self.pheromon_list:
+                elif self.has_pheromon((r, c)):
                     row_display.append(" P ")
                 else:
                     row_display.append(f"{self.grid[r, c]:^3}")
@@ -70,33 +97,229 @@ class GridWorld:
         print()
 
 
-initial_pheromons = 1
-found_home = False
-
-while not found_home:
-    print(f"Starting episode with MaxPheromons = {initial_pheromons}")
-    gridworld = GridWorld(initial_pheromons)
-    step_count = 0
-
-    while True:
-        step_count += 1
-        L = ["north", "south", "east", "west"]
-        direction = random.choice(L)
-        gridworld.move_ant(direction)
-        print(f"Step {step_count}")
-        gridworld.display_grid()
-        time.sleep(0.17)
-        
-        if gridworld.find_food():
-            # Try to return home if food is found
-            if gridworld.go_home():
-                print(f"Ant successfully returned home with MaxPheromons = {initial_pheromons}")
-                found_home = True
-                break
-            else:
-                # If the ant ran out of pheromones while returning, stop this episode
-                print(f"Ant ran out of pheromones with MaxPheromons = {initial_pheromons}. Restarting with more pheromones.")
-                initial_pheromons += 1
-                break  # Exit the inner loop and start a new episode
-
-    time.sleep(2)
+def required_pheromons(path, home=(0, 0)):
+    """
+    Shortest trail that still contains home at the end of a recorded path.
+
+    path holds the positions visited after each move (what leave_pheromon records).
+    go_home succeeds exactly when MaxPheromons is at least the returned value;
+    None means home was never revisited, so no trail length is enough.
+    """
+    for i in range(len(path) - 1, -1, -1):
+        if tuple(path[i]) == tuple(home):
+            return len(path) - i
+    return None
+
+def sample_required_pheromons(n_episodes, rows=4, cols=6, home=(0, 0), food=None,
+                              max_steps=100000, rng=None):
+    """
+    Run many random-walk episodes at once and record the trail each one needs.
+
+    Every episode walks from home with uniformly random directions until it steps
+    on food, exactly like the interactive loop but without printing or sleeping.
+    Instead of restarting with MaxPheromons + 1, the required trail length is
+    read off each path directly (see required_pheromons).
+
+    Returns a float array of length n_episodes: the required MaxPheromons, inf if
+    the ant never passed home again, or nan if it found no food within max_steps.
+    """
+    rng = np.random.default_rng(rng)
+    if food is None:
+        food = [(rows - 1, cols - 1), (rows - 1, 0)]
+    food_mask = np.zeros((rows, cols), dtype=bool)
+    for position in food:
+        food_mask[position] = True
+    upper = np.array([rows - 1, cols - 1])
+
+    positions = np.tile(np.asarray(home), (n_episodes, 1))
+    last_home = np.full(n_episodes, -1)
+    required = np.full(n_episodes, np.nan)
+    active = np.arange(n_episodes)
+
+    for step in range(1, max_steps + 1):
+        moves = DIRECTION_OFFSETS[rng.integers(len(DIRECTIONS), size=active.size)]
+        # Moves into a wall leave the ant where it is, as in Ant.move
+        current = np.clip(positions[active] + moves, 0, upper)
+        positions[active] = current
+
+        at_home = (current[:, 0] == home[0]) & (current[:, 1] == home[1])
+        last_home[active[at_home]] = step
+
+        found = food_mask[current[:, 0], current[:, 1]]
+        finished = active[found]
+        seen_home = last_home[finished] >= 0
+        required[finished] = np.where(seen_home, step - last_home[finished] + 1, np.inf)
+
+        active = active[~found]
+        if active.size == 0:
+            break
+
+    return required
+
+def first_sufficient_pheromons(required):
+    """
+    MaxPheromons at which the interactive loop would stop, given per-episode requirements.
+
+    The loop starts at 1 and adds one pheromone after every failed episode, so it stops
+    at the first episode k (0-based) whose requirement is at most k + 1.
+    Returns None if no episode in the sample would have succeeded.
+    """
+    required = np.asarray(required, dtype=float)
+    budgets = np.arange(1, required.size + 1)
+    success = np.flatnonzero(required <= budgets)
+    return int(budgets[success[0]]) if success.size else None
+
+class AntColony:
+    """
+    Many ants foraging at once on a NumPy pheromone field.
+
+    Positions are kept in an (n_ants, 2) array and every step is a handful of
+    array operations: the field evaporates and diffuses, every ant samples its
+    next move biased by pheromone, and deposits are added with np.add.at.
+    The field has two layers: searching ants lay a "home" trail (layer 0) and
+    follow the "food" trail (layer 1); ants carrying food do the opposite.
+
+    With n_ants=1 and beta=0 the move choice is uniform, which is the random
+    walk of the single Ant in GridWorld.
+    """
+    HOME_TRAIL = 0
+    FOOD_TRAIL = 1
+
+    def __init__(self, n_ants, rows=4, cols=6, home=(0, 0), food=None, evaporation=0.05,
+                 diffusion=0.1, deposit=1.0, trail_decay=0.95, alpha=0.1, beta=1.0, rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.home = home
+        self.food = list(food) if food is not None else [(rows - 1, cols - 1), (rows - 1, 0)]
+        self.evaporation = evaporation  # Fraction of pheromone lost per step
+        self.diffusion = diffusion  # Fraction of pheromone that spreads to the neighbours per step
+        self.deposit = deposit  # Pheromone left by each ant on the step it leaves home or food
+        self.trail_decay = trail_decay  # Deposit shrinks by this factor for every step away from the source
+        self.alpha = alpha  # Base attractiveness of a cell without pheromone
+        self.beta = beta  # How strongly ants follow pheromone (0 = random walk)
+        self.rng = np.random.default_rng(rng)
+
+        self.pheromone = np.zeros((2, rows, cols))
+        self.food_mask = np.zeros((rows, cols), dtype=bool)
+        for position in self.food:
+            self.food_mask[position] = True
+        self.positions = np.tile(np.asarray(home), (n_ants, 1))
+        self.carrying = np.zeros(n_ants, dtype=bool)
+        self.steps_away = np.zeros(n_ants)
+        self.deliveries = 0
+        self.step_count = 0
+
+        # Number of in-grid neighbours of every cell, used to average during diffusion;
+        # counted with the same shifted slices as diffuse so 1-wide grids come out right
+        # (kept at least 1 so a 1x1 grid divides its zero sum by 1)
+        neighbour_counts = np.zeros((rows, cols))
+        neighbour_counts[1:, :] += 1
+        neighbour_counts[:-1, :] += 1
+        neighbour_counts[:, 1:] += 1
+        neighbour_counts[:, :-1] += 1
+        self._neighbour_counts = np.maximum(neighbour_counts, 1.0)
+        self._neighbour_sum = np.empty_like(self.pheromone)
+        self._upper = np.array([rows - 1, cols - 1])
+        self._ant_index = np.arange(n_ants)
+
+    @classmethod
+    def from_gridworld(cls, gridworld, n_ants=1, **kwargs):
+        """Start a colony on the same grid, home and food layout as a GridWorld."""
+        rows, cols = gridworld.grid.shape
+        return cls(n_ants, rows, cols, home=gridworld.home, food=gridworld.food, **kwargs)
+
+    @property
+    def n_ants(self):
+        return len(self.positions)
+
+    def evaporate(self):
+        self.pheromone *= 1 - self.evaporation
+
+    def diffuse(self):
+        # Sum of the in-grid neighbours of every cell via shifted slices
+        total = self._neighbour_sum
+        total.fill(0.0)
+        total[:, 1:, :] += self.pheromone[:, :-1, :]
+        total[:, :-1, :] += self.pheromone[:, 1:, :]
+        total[:, :, 1:] += self.pheromone[:, :, :-1]
+        total[:, :, :-1] += self.pheromone[:, :, 1:]
+        total /= self._neighbour_counts
+        self.pheromone *= 1 - self.diffusion
+        self.pheromone += self.diffusion * total
+
+    def choose_moves(self):
+        """Sample the next position of every ant at once."""
+        candidates = np.clip(self.positions[:, None, :] + DIRECTION_OFFSETS[None, :, :], 0, self._upper)
+        # Searching ants follow the food trail, loaded ants the home trail
+        layer = np.where(self.carrying, self.HOME_TRAIL, self.FOOD_TRAIL)
+        levels = self.pheromone[layer[:, None], candidates[..., 0], candidates[..., 1]]
+        weights = np.cumsum((self.alpha + levels) ** self.beta, axis=1)
+        threshold = self.rng.random(self.n_ants) * weights[:, -1]
+        choice = np.minimum((weights <= threshold[:, None]).sum(axis=1), len(DIRECTIONS) - 1)
+        return candidates[self._ant_index, choice]
+
+    def step(self):
+        self.evaporate()
+        if self.diffusion:
+            self.diffuse()
+        self.positions = self.choose_moves()
+        rows, cols = self.positions[:, 0], self.positions[:, 1]
+
+        # Trails are strongest near where they start, so following them leads back to it
+        layer = np.where(self.carrying, self.FOOD_TRAIL, self.HOME_TRAIL)
+        np.add.at(self.pheromone, (layer, rows, cols), self.deposit * self.trail_decay ** self.steps_away)
+        self.steps_away += 1
+
+        # Pick up food and drop it off at home
+        picked = ~self.carrying & self.food_mask[rows, cols]
+        at_home = (rows == self.home[0]) & (cols == self.home[1])
+        delivered = self.carrying & at_home
+        self.carrying[picked] = True
+        self.carrying[delivered] = False
+        self.steps_away[picked | at_home] = 0
+        self.deliveries += int(delivered.sum())
+        self.step_count += 1
+        return int(delivered.sum())
+
+    def run(self, steps):
+        """Run the colony and return the number of food deliveries at each step."""
+        deliveries = np.zeros(steps, dtype=int)
+        for i in range(steps):
+            deliveries[i] = self.step()
+        return deliveries
+
+def main(rng=None):
+    rng = np.random.default_rng(rng)
+    initial_pheromons = 1
+    found_home = False
+
+    while not found_home:
+        print(f"Starting episode with MaxPheromons = {initial_pheromons}")
+        gridworld = GridWorld(initial_pheromons)
+        step_count = 0
+
+        while True:
+            step_count += 1
+            L = ["north", "south", "east", "west"]
+            direction = L[rng.integers(len(L))]
+            gridworld.move_ant(direction)
+            print(f"Step {step_count}")
+            gridworld.display_grid()
+            time.sleep(0.17)
+
+            if gridworld.find_food():
+                # Try to return home if food is found
+                if gridworld.go_home():
+                    print(f"Ant successfully returned home with MaxPheromons = {initial_pheromons}")
+                    found_home = True
+                    break
+                else:
+                    # If the ant ran out of pheromones while returning, stop this episode
+                    print(f"Ant ran out of pheromones with MaxPheromons = {initial_pheromons}. Restarting with more pheromones.")
+                    initial_pheromons += 1
+                    break  # Exit the inner loop and start a new episode
+
+        time.sleep(2)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from instrumentation import count, phase
 
 # Define the Boid class
 class Boid: # Boid setup
@@ -35,6 +36,7 @@ class Boid: # Boid setup
         # Calculate forces
         separation = self.avoid_others(flock)
         cohesion = self.stay_with_flock(flock)
+        count("boid.distance_checks", 2 * len(flock))
         self.velocity += separation + cohesion # Adjust velocity
         speed = np.linalg.norm(self.velocity) # Limit speed
         if speed > max_speed:
@@ -44,42 +46,52 @@ class Boid: # Boid setup
         self.position += self.velocity # Update position
 
 
-def simulate_flock(num_boids, steps): # Function to simulate the boid flock
+def simulate_flock(num_boids, steps, rng=None): # Function to simulate the boid flock
     """
     Create a group of boids and simulate their behavior over time.
+    rng is a numpy Generator, a seed or None.
     """
-    # Initialize boids with random positions and velocities
+    # Initialize boids with random positions and velocities, drawn for the whole flock at once
+    rng = np.random.default_rng(rng)
+    positions = rng.uniform(0, 100, (num_boids, 2))
+    velocities = rng.uniform(-2, 2, (num_boids, 2))
     flock = [
-        Boid(
-            position=np.random.uniform(0, 100, 2),
-            velocity=np.random.uniform(-2, 2, 2)
-        )
-        for _ in range(num_boids)
+        Boid(position=position, velocity=velocity)
+        for position, velocity in zip(positions, velocities)
     ]
 
     # Track positions over time
     all_positions = []
     for _ in range(steps):
-        positions = []
-        for boid in flock:
-            boid.update_position(flock)
-            positions.append(boid.position.copy())
-        all_positions.append(np.array(positions))
+        with phase("flock.step"):
+            positions = []
+            for boid in flock:
+                boid.update_position(flock)
+                positions.append(boid.position.copy())
+            all_positions.append(np.array(positions))
 
     return all_positions
 
 
-number_of_boids = 10 # number of boids
-number_of_steps = 100 # number of steps
-boid_positions = simulate_flock(number_of_boids,number_of_steps) # Run the simulation
+def main():
+    number_of_boids = 10 # number of boids
+    number_of_steps = 100 # number of steps
+    boid_positions = simulate_flock(number_of_boids,number_of_steps) # Run the simulation
+
+    # Visualize the boid movements
+    import matplotlib.pyplot as plt
+
+    with phase("render"):
+        for step in range(0, len(boid_positions), 10):  # Plot every 10th step
+            positions = boid_positions[step]
+            plt.scatter(positions[:, 0], positions[:, 1], label=f"Step {step}")
+
+    plt.title("Boid Flocking Simulation")
+    plt.xlabel("X Position")
+    plt.ylabel("Y Position")
+    plt.legend()
+    plt.show()
 
-# Visualize the boid movements
-for step in range(0, len(boid_positions), 10):  # Plot every 10th step
-    positions = boid_positions[step]
-    plt.scatter(positions[:, 0], positions[:, 1], label=f"Step {step}")
 
-plt.title("Boid Flocking Simulation")
-plt.xlabel("X Position")
-plt.ylabel("Y Position")
-plt.legend()
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,143 @@
-import matplotlib.pyplot as plt
+import numpy as np
+
+# Single-step update rules: each takes f, the current (t, y) and the step size
+def euler_step(f, t, y, step):
+    return y + step * f(t, y)
+
+def heun_step(f, t, y, step):
+    k1 = f(t, y)
+    k2 = f(t + step, y + step * k1)
+    return y + step * (k1 + k2) / 2
+
+def rk4_step(f, t, y, step):
+    k1 = f(t, y)
+    k2 = f(t + step / 2, y + step / 2 * k1)
+    k3 = f(t + step / 2, y + step / 2 * k2)
+    k4 = f(t + step, y + step * k3)
+    return y + step * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+
+STEPPERS = {"euler": euler_step, "heun": heun_step, "rk4": rk4_step}
+STAGES = {"euler": 1, "heun": 2, "rk4": 4}  # Evaluations of f per step
+
+# Function to solve an ODE with a fixed step size
+def solve_fixed_step(f, y_init, t_range, step, method="euler"):
+    """
+    Integrate dy/dt = f(t, y) over t_range with a fixed-step method ("euler", "heun" or "rk4").
+
+    y_init may be a scalar or an array, so a system of equations or a batch of initial
+    conditions is integrated in one call as long as f works on arrays. The number of
+    steps is fixed up front from the interval, so t never drifts from accumulating step,
+    and the outputs are preallocated: t_values has shape (n,) and y_values (n,) + shape(y_init).
+    """
+    stepper = STEPPERS[method]
+    n_steps = int(np.floor((t_range[1] - t_range[0]) / step + 1e-9))
+    t_values = t_range[0] + step * np.arange(n_steps + 1)
+
+    y = np.asarray(y_init, dtype=float)
+    y_values = np.empty((n_steps + 1,) + y.shape)
+    y_values[0] = y
+    for i in range(n_steps):
+        y = stepper(f, t_values[i], y, step)
+        y_values[i + 1] = y
+    return t_values, y_values
 
 # Function to apply Euler's method for solving ODEs
 def solve_euler(f, y_init, t_range, step):
-    t_values = []
-    y_values = []
-
-    t = t_range[0]
-    y = y_init
-    while t <= t_range[1]:
-        t_values.append(t)
-        y_values.append(y)
-        y += f(t, y) * step  # Euler update for y
-        t += step  # Increment time
-    return t_values, y_values
+    return solve_fixed_step(f, y_init, t_range, step, method="euler")
+
+# Dormand-Prince 5(4) coefficients for the adaptive solver
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_E = DP_B - np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+# Function to solve an ODE with an error-controlled step size
+def solve_adaptive(f, y_init, t_range, rtol=1e-6, atol=1e-9, first_step=None, max_steps=100000):
+    """
+    Integrate dy/dt = f(t, y) with the adaptive Dormand-Prince 5(4) method.
+
+    Each step estimates its local error from the embedded 4th-order solution and the
+    step size is adjusted to keep the error below atol + rtol * |y|. Smooth solutions
+    need far fewer evaluations of f than a fixed step small enough for the same accuracy.
+    Returns t_values, y_values and the number of evaluations of f. Raises RuntimeError
+    if t_range[1] is not reached within max_steps attempted steps.
+    """
+    t, t_end = float(t_range[0]), float(t_range[1])
+    y = np.asarray(y_init, dtype=float)
+    k = np.empty((7,) + y.shape)
+    k[0] = f(t, y)
+    n_evaluations = 1
+    step = first_step if first_step is not None else 0.01 * (t_end - t)
+
+    # Output buffers grow by doubling since the number of accepted steps is unknown
+    t_values = np.empty(64)
+    y_values = np.empty((64,) + y.shape)
+    t_values[0], y_values[0] = t, y
+    n = 1
+
+    for _ in range(max_steps):
+        if t >= t_end:
+            break
+        step = min(step, t_end - t)
+        for i in range(1, 7):
+            y_stage = y + step * np.tensordot(DP_A[i], k[:i], axes=1)
+            k[i] = f(t + DP_C[i] * step, y_stage)
+        n_evaluations += 6
+        y_new = y + step * np.tensordot(DP_B, k, axes=1)
+        error = step * np.tensordot(DP_E, k, axes=1)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error_norm = np.sqrt(np.mean((error / scale) ** 2))
+
+        if error_norm <= 1:
+            t += step
+            y = y_new
+            k[0] = k[6]  # First stage of the next step is the last of this one
+            if n == len(t_values):
+                t_values = np.concatenate([t_values, np.empty_like(t_values)])
+                y_values = np.concatenate([y_values, np.empty_like(y_values)])
+            t_values[n], y_values[n] = t, y
+            n += 1
+        factor = 5.0 if error_norm == 0 else min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+        step *= factor
+
+    if t < t_end:
+        raise RuntimeError(f"solve_adaptive reached t={t:.6g} of {t_end:.6g} in max_steps={max_steps} steps; "
+                           f"increase max_steps or loosen rtol/atol")
+    return t_values[:n], y_values[:n], n_evaluations
 
 # Define the ODE dy/dt = -2y
 def model(t, y):
     return -2 * y
 
-# Simulation setup
-initial_y = 1  # Initial condition y(0)
-time_interval = (0, 5)  # Time range [start, end]
-time_step = 0.1  # Step size
-
-# Solve the equation
-time_series, solution = solve_euler(model, initial_y, time_interval, time_step)
-
-# Visualization
-plt.figure(figsize=(8, 5))
-plt.plot(time_series, solution, label=f"Euler ∆t={time_step}")
-plt.xlabel("Time (t)")
-plt.ylabel("y(t)")
-plt.title("Euler's Method Applied to dy/dt = -2y")
-plt.legend(loc="upper right")
-plt.grid(True)
-plt.show()
+def main():
+    # Simulation setup
+    initial_y = 1  # Initial condition y(0)
+    time_interval = (0, 5)  # Time range [start, end]
+    time_step = 0.1  # Step size
+
+    # Solve the equation
+    time_series, solution = solve_euler(model, initial_y, time_interval, time_step)
+
+    # Visualization
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 5))
+    plt.plot(time_series, solution, label=f"Euler ∆t={time_step}")
+    plt.xlabel("Time (t)")
+    plt.ylabel("y(t)")
+    plt.title("Euler's Method Applied to dy/dt = -2y")
+    plt.legend(loc="upper right")
+    plt.grid(True)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
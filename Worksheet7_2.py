@@ -1,4 +1,4 @@
-import matplotlib.pyplot as plt
+import numpy as np
 
 # Function to simulate an SIR model
 def simulate_sir(initial_conditions, parameters, time_step, duration):
@@ -17,27 +17,229 @@ def simulate_sir(initial_conditions, parameters, time_step, duration):
 
     return S, I, R
 
-# Model parameters and initial conditions
-initial_conditions = {'S': 0.99, 'I': 0.01, 'R': 0}
-parameters = {'beta': 0.3, 'gamma': 0.1}
-time_step = 0.1
-duration = 160
-
-# Run the simulation
-S, I, R = simulate_sir(initial_conditions, parameters, time_step, duration)
-
-# Generate time points
-time_points = [i * time_step for i in range(len(S))]
-
-# Visualization
-plt.figure(figsize=(10, 6))
-plt.plot(time_points, S, label="Susceptible", linewidth=2)
-plt.plot(time_points, I, label="Infected", linewidth=2)
-plt.plot(time_points, R, label="Recovered", linewidth=2)
-plt.xlabel("Time (days)", fontsize=12)
-plt.ylabel("Proportion of Population", fontsize=12)
-plt.title("SIR Model Dynamics", fontsize=14)
-plt.legend(fontsize=12)
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+# Function to simulate many SIR models at once
+def simulate_sir_batch(initial_conditions, parameters, time_step, duration,
+                       stop_threshold=None, store_trajectories=True):
+    """
+    Integrate a batch of SIR models together with the same Euler update as simulate_sir.
+
+    Every entry of initial_conditions ('S', 'I', 'R') and parameters ('beta', 'gamma')
+    may be a scalar or an array; they are broadcast to a common batch shape (B,).
+    If stop_threshold is given, a member stops (and keeps its last state) once I has
+    dropped below the threshold while falling. With store_trajectories=False only the
+    summary is kept, so memory does not grow with the number of steps.
+
+    Returns (trajectories, summary): trajectories is a (steps + 1, B, 3) array of
+    S, I, R or None, and summary holds per-member arrays 'peak_I', 'peak_time',
+    'final_R' and 'stop_time'.
+    """
+    S, I, R, beta, gamma = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (
+            initial_conditions['S'], initial_conditions['I'], initial_conditions['R'],
+            parameters['beta'], parameters['gamma'])))
+    state = np.stack([S, I, R], axis=-1)
+    beta, gamma = beta.copy(), gamma.copy()
+    time_steps = int(duration / time_step)
+    batch = state.shape[0]
+
+    trajectories = None
+    if store_trajectories:
+        trajectories = np.empty((time_steps + 1, batch, 3))
+        trajectories[0] = state
+
+    peak_I = state[:, 1].copy()
+    peak_step = np.zeros(batch, dtype=int)
+    stop_step = np.full(batch, time_steps)
+    active = np.arange(batch)
+
+    for step in range(1, time_steps + 1):
+        S, I = state[active, 0], state[active, 1]
+        new_infections = beta[active] * S * I * time_step
+        recoveries = gamma[active] * I * time_step
+        state[active, 0] -= new_infections
+        state[active, 1] += new_infections - recoveries
+        state[active, 2] += recoveries
+
+        I = state[active, 1]
+        higher = I > peak_I[active]
+        peak_I[active[higher]] = I[higher]
+        peak_step[active[higher]] = step
+
+        if trajectories is not None:
+            trajectories[step] = state
+
+        if stop_threshold is not None:
+            stopped = (I < stop_threshold) & (new_infections < recoveries)
+            if stopped.any():
+                stop_step[active[stopped]] = step
+                active = active[~stopped]
+                if active.size == 0:
+                    if trajectories is not None:
+                        trajectories[step + 1:] = state
+                    break
+
+    summary = {
+        'peak_I': peak_I,
+        'peak_time': peak_step * time_step,
+        'final_R': state[:, 2].copy(),
+        'stop_time': stop_step * time_step,
+    }
+    return trajectories, summary
+
+# Stochastic SIR models for a finite population of individuals
+def initial_counts(initial_conditions, population):
+    """Convert the S, I, R proportions of initial_conditions to whole numbers of individuals."""
+    I = int(round(initial_conditions['I'] * population))
+    R = int(round(initial_conditions['R'] * population))
+    return population - I - R, I, R
+
+def _stochastic_summary(S, I, R, peak_I, peak_time, extinction_time, population):
+    return {
+        'final_S': S,
+        'final_I': I,
+        'final_R': R,
+        'final_size': population - S,  # Everyone ever infected, including the initial cases
+        'peak_I': peak_I,
+        'peak_time': peak_time,
+        'extinction_time': extinction_time,  # nan if infections were still present at the end
+    }
+
+def simulate_sir_gillespie(initial_conditions, parameters, population, duration, replicates, rng=None):
+    """
+    Exact stochastic SIR (Gillespie's direct method) for many replicates at once.
+
+    Infection happens at rate beta * S * I / N and recovery at rate gamma * I, matching
+    the mean-field simulate_sir as N grows. All replicates draw their next event together
+    with one vectorized draw per event index, and finished replicates drop out of the batch.
+    Returns a dict of per-replicate arrays (see _stochastic_summary).
+    """
+    rng = np.random.default_rng(rng)
+    beta, gamma = parameters['beta'], parameters['gamma']
+    S0, I0, R0 = initial_counts(initial_conditions, population)
+    S = np.full(replicates, S0)
+    I = np.full(replicates, I0)
+    R = np.full(replicates, R0)
+    t = np.zeros(replicates)
+    peak_I = I.copy()
+    peak_time = np.zeros(replicates)
+    extinction_time = np.where(I == 0, 0.0, np.nan)
+    active = np.flatnonzero(I > 0)
+
+    while active.size:
+        s, i = S[active], I[active]
+        infection_rate = beta * s * i / population
+        total_rate = infection_rate + gamma * i
+        t_next = t[active] + rng.exponential(1.0, active.size) / total_rate
+
+        # Replicates whose next event falls after the end stop without applying it
+        in_time = t_next <= duration
+        active, t_next = active[in_time], t_next[in_time]
+        infection = (rng.random(active.size) * total_rate[in_time]) < infection_rate[in_time]
+        recovery = ~infection
+
+        S[active] -= infection
+        I[active] += infection.astype(int) - recovery
+        R[active] += recovery
+        t[active] = t_next
+
+        higher = I[active] > peak_I[active]
+        peak_I[active[higher]] = I[active[higher]]
+        peak_time[active[higher]] = t_next[higher]
+
+        extinct = I[active] == 0
+        extinction_time[active[extinct]] = t_next[extinct]
+        active = active[~extinct]
+
+    return _stochastic_summary(S, I, R, peak_I, peak_time, extinction_time, population)
+
+def simulate_sir_tau_leap(initial_conditions, parameters, population, duration, replicates,
+                          time_step=0.1, rng=None):
+    """
+    Approximate stochastic SIR with fixed time steps (tau-leaping) for many replicates.
+
+    In each step every susceptible is infected with probability 1 - exp(-beta * I / N * dt)
+    and every infected recovers with probability 1 - exp(-gamma * dt), drawn as binomials
+    for all replicates at once. Much faster than simulate_sir_gillespie for large N.
+    Returns a dict of per-replicate arrays (see _stochastic_summary).
+    """
+    rng = np.random.default_rng(rng)
+    beta, gamma = parameters['beta'], parameters['gamma']
+    S0, I0, R0 = initial_counts(initial_conditions, population)
+    S = np.full(replicates, S0)
+    I = np.full(replicates, I0)
+    R = np.full(replicates, R0)
+    peak_I = I.copy()
+    peak_time = np.zeros(replicates)
+    extinction_time = np.where(I == 0, 0.0, np.nan)
+    p_recover = 1 - np.exp(-gamma * time_step)
+    time_steps = int(duration / time_step)
+    active = np.flatnonzero(I > 0)
+
+    for step in range(1, time_steps + 1):
+        if active.size == 0:
+            break
+        s, i = S[active], I[active]
+        infections = rng.binomial(s, 1 - np.exp(-beta * i / population * time_step))
+        recoveries = rng.binomial(i, p_recover)
+        S[active] = s - infections
+        I[active] = i + infections - recoveries
+        R[active] += recoveries
+
+        i = I[active]
+        higher = i > peak_I[active]
+        peak_I[active[higher]] = i[higher]
+        peak_time[active[higher]] = step * time_step
+
+        extinct = i == 0
+        extinction_time[active[extinct]] = step * time_step
+        active = active[~extinct]
+
+    return _stochastic_summary(S, I, R, peak_I, peak_time, extinction_time, population)
+
+def iter_stochastic_sir(initial_conditions, parameters, population, duration, replicates,
+                        method="tau_leap", chunk_size=1000, rng=None, **kwargs):
+    """
+    Run replicates in chunks and yield one summary dict per replicate as they finish.
+
+    method is "tau_leap" or "gillespie"; extra keyword arguments (e.g. time_step) go to
+    the engine. Memory stays bounded by chunk_size however many replicates are requested.
+    """
+    engine = {"tau_leap": simulate_sir_tau_leap, "gillespie": simulate_sir_gillespie}[method]
+    rng = np.random.default_rng(rng)
+    for start in range(0, replicates, chunk_size):
+        count = min(chunk_size, replicates - start)
+        summary = engine(initial_conditions, parameters, population, duration, count, rng=rng, **kwargs)
+        for k in range(count):
+            yield {key: values[k].item() for key, values in summary.items()}
+
+def main():
+    # Model parameters and initial conditions
+    initial_conditions = {'S': 0.99, 'I': 0.01, 'R': 0}
+    parameters = {'beta': 0.3, 'gamma': 0.1}
+    time_step = 0.1
+    duration = 160
+
+    # Run the simulation
+    S, I, R = simulate_sir(initial_conditions, parameters, time_step, duration)
+
+    # Generate time points
+    time_points = [i * time_step for i in range(len(S))]
+
+    # Visualization
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(time_points, S, label="Susceptible", linewidth=2)
+    plt.plot(time_points, I, label="Infected", linewidth=2)
+    plt.plot(time_points, R, label="Recovered", linewidth=2)
+    plt.xlabel("Time (days)", fontsize=12)
+    plt.ylabel("Proportion of Population", fontsize=12)
+    plt.title("SIR Model Dynamics", fontsize=14)
+    plt.legend(fontsize=12)
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
-import random
+import numpy as np
 
 ########################################
 # 1. List of Agents Model
 ########################################
-def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0):
+def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0, rng=None):
     """
     Run the list-of-agents model.
 
@@ -19,22 +19,27 @@ def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0):
         Number of time steps to simulate.
     mutation_rate : float
         Probability that an offspring mutates to the other genotype.
+    rng : numpy.random.Generator, int or None
+        Random generator or seed.
 
     Returns
     -------
     population_history : list of lists
         A history of the population at each timestep.
     """
+    rng = np.random.default_rng(rng)
     population = initial_population[:]
     population_history = [population]
 
     for _ in range(timesteps):
+        # One mutation draw per offspring, for the whole generation at once
+        mutations = (rng.random(len(population)) < mutation_rate).tolist()
         new_population = []
-        for agent in population:
+        for agent, mutates in zip(population, mutations):
             # Parent reproduces (copies) itself
             offspring_type = agent
             # Check for mutation
-            if random.random() < mutation_rate:
+            if mutates:
                 offspring_type = 'a' if agent == 'b' else 'b'
             
             # The next generation includes both the original and the offspring
@@ -46,9 +51,75 @@ def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0):
     
     return population_history
 
+def count_population(population):
+    """Return the (n_a, n_b) counts of a list-of-agents population."""
+    return population.count('a'), population.count('b')
+
+def run_count_model(initial_counts, timesteps, mutation_rate=0.0, replicates=None, rng=None):
+    """
+    Run the list-of-agents model on genotype counts instead of agent lists.
+
+    The list model only depends on how many 'a' and 'b' agents there are: every
+    agent keeps itself and adds one offspring, and each offspring mutates with
+    probability `mutation_rate`. So the next counts are
+    n_a' = 2 n_a - Bin(n_a, mu) + Bin(n_b, mu) (and symmetrically for b), which has
+    the same distribution as run_list_of_agents_model while using O(T) memory.
+
+    Parameters
+    ----------
+    initial_counts : tuple of int or list
+        Initial (n_a, n_b), or a population list such as ['a', 'a', 'b'].
+    timesteps : int
+        Number of time steps to simulate.
+    mutation_rate : float
+        Probability that an offspring mutates to the other genotype.
+    replicates : int or None
+        Number of independent runs to simulate in one vectorized call.
+    rng : numpy.random.Generator, int or None
+        Random generator or seed.
+
+    Returns
+    -------
+    counts : np.ndarray
+        Integer array of shape (timesteps + 1, 2) with columns (n_a, n_b), or
+        (replicates, timesteps + 1, 2) if `replicates` is given.
+    """
+    if isinstance(initial_counts, list):
+        initial_counts = count_population(initial_counts)
+    rng = np.random.default_rng(rng)
+    if sum(initial_counts) * 2.0 ** timesteps >= 2 ** 63:
+        raise ValueError("population would overflow int64; use fewer timesteps")
+
+    batch = () if replicates is None else (replicates,)
+    counts = np.empty(batch + (timesteps + 1, 2), dtype=np.int64)
+    counts[..., 0, :] = initial_counts
+
+    for t in range(timesteps):
+        n_a, n_b = counts[..., t, 0], counts[..., t, 1]
+        if mutation_rate > 0.0:
+            a_to_b = rng.binomial(n_a, mutation_rate)
+            b_to_a = rng.binomial(n_b, mutation_rate)
+        else:
+            a_to_b = b_to_a = 0
+        counts[..., t + 1, 0] = 2 * n_a - a_to_b + b_to_a
+        counts[..., t + 1, 1] = 2 * n_b - b_to_a + a_to_b
+
+    return counts
+
 ########################################
 # 2. Simple Grid World Model
 ########################################
+def uniform_stream(rng, block_size=4096):
+    """
+    Endless iterator of uniform [0, 1) floats for scalar Python loops.
+
+    The numbers are drawn from `rng` in blocks, which is much cheaper than one
+    Generator call per number.
+    """
+    rng = np.random.default_rng(rng)
+    while True:
+        yield from rng.random(block_size).tolist()
+
 def get_neighbors(r, c, rows, cols):
     # Return valid orthogonal neighbors for cell (r,c)
     neighbors = []
@@ -60,7 +131,7 @@ def get_neighbors(r, c, rows, cols):
 
 def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1, 
                           timesteps=10, mutation_rate=0.0, death_prob=0.0,
-                          allow_multiple=False):
+                          allow_multiple=False, history="full", stride=1, rng=None):
     """
     Run the simple grid world model.
 
@@ -91,10 +162,18 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
         Probability an agent dies each timestep.
     allow_multiple : bool
         If True, allow multiple agents per cell.
+    history : str
+        'full' keeps every grid as nested lists. 'strided', 'delta', 'counts' or
+        'none' record the run in a GridHistory instead (grids encoded as int8 cell
+        codes, or as (rows, cols, 2) counts if allow_multiple).
+    stride : int
+        Snapshot interval for history='strided'.
+    rng : numpy.random.Generator, int or None
+        Random generator or seed.
 
     Returns
     -------
-    grid_history : list of 2D lists or list of 2D lists of lists
+    grid_history : list of 2D lists or list of 2D lists of lists, or GridHistory
         The history of the grid configuration at each timestep.
     """
 
@@ -107,12 +186,16 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
         grid = [[[] for _ in range(cols)] for _ in range(rows)]
 
     # Random initial placement of agents
+    rng = np.random.default_rng(rng)
+    uniforms = uniform_stream(rng)
     num_to_fill = int(rows * cols * initial_fill)
     all_positions = [(r,c) for r in range(rows) for c in range(cols)]
-    random.shuffle(all_positions)
+    rng.shuffle(all_positions)
+    live_counts = {'a': 0, 'b': 0}  # Updated on every birth and death, never rescanned
     for i in range(num_to_fill):
         r, c = all_positions[i]
-        agent_type = random.choice(['a','b'])
+        agent_type = 'ab'[int(next(uniforms) * 2)]
+        live_counts[agent_type] += 1
         if not allow_multiple:
             grid[r][c] = agent_type
         else:
@@ -136,6 +219,11 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
                     count_b += cell.count('b')
             return count_a, count_b
 
+    encode = encode_stacked_grid if allow_multiple else encode_grid
+    if history != "full":
+        recorder = GridHistory(encode(grid), [live_counts['a'], live_counts['b']], timesteps,
+                               mode=history, stride=stride)
+
     # Store initial state
     if not allow_multiple:
         grid_history = [ [row[:] for row in grid] ]
@@ -156,14 +244,14 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
                 for c in range(cols):
                     if grid[r][c] in ['a','b']:
                         # Reproduction attempt
-                        if random.random() < reproduction_prob:
+                        if next(uniforms) < reproduction_prob:
                             nbrs = get_neighbors(r, c, rows, cols)
                             free_nbrs = [(nr, nc) for (nr, nc) in nbrs if grid[nr][nc] == '.']
                             if free_nbrs:
-                                nr, nc = random.choice(free_nbrs)
+                                nr, nc = free_nbrs[int(next(uniforms) * len(free_nbrs))]
                                 new_type = grid[r][c]
                                 # Mutation
-                                if random.random() < mutation_rate:
+                                if next(uniforms) < mutation_rate:
                                     new_type = 'b' if new_type == 'a' else 'a'
                                 offspring_positions.append((nr, nc, new_type))
 
@@ -171,16 +259,23 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
             for (nr, nc, tp) in offspring_positions:
                 if grid[nr][nc] == '.':
                     grid[nr][nc] = tp
+                    live_counts[tp] += 1
 
             # Death step
             if death_prob > 0.0:
                 for r in range(rows):
                     for c in range(cols):
                         if grid[r][c] in ['a','b']:
-                            if random.random() < death_prob:
+                            if next(uniforms) < death_prob:
+                                live_counts[grid[r][c]] -= 1
                                 grid[r][c] = '.'
 
             # Snapshot
+            if history != "full":
+                # Only encode the grid for steps whose frame the recorder keeps
+                frame = encode(grid) if recorder.needs_grid() else None
+                recorder.record(frame, [live_counts['a'], live_counts['b']])
+                continue
             snapshot = [row[:] for row in grid]
             grid_history.append(snapshot)
 
@@ -197,21 +292,24 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
                     alive_agents = []
                     for agent_type in new_cell_agents:
                         # Reproduction
-                        if random.random() < reproduction_prob:
+                        if next(uniforms) < reproduction_prob:
                             nbrs = get_neighbors(r, c, rows, cols)
                             # Since multiple occupancy is allowed, no need for checking '.' cells
                             # Just place offspring in a random neighbor cell
                             if nbrs:
-                                nr, nc = random.choice(nbrs)
+                                nr, nc = nbrs[int(next(uniforms) * len(nbrs))]
                                 new_type = agent_type
                                 # Mutation
-                                if random.random() < mutation_rate:
+                                if next(uniforms) < mutation_rate:
                                     new_type = 'b' if new_type == 'a' else 'a'
                                 new_grid[nr][nc].append(new_type)
+                                live_counts[new_type] += 1
 
                         # Death
-                        if death_prob == 0.0 or random.random() > death_prob:
+                        if death_prob == 0.0 or next(uniforms) > death_prob:
                             alive_agents.append(agent_type)
+                        else:
+                            live_counts[agent_type] -= 1
 
                     # Update cell with alive agents
                     new_grid[r][c] = alive_agents
@@ -219,14 +317,429 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
             grid = new_grid
 
             # Snapshot
+            if history != "full":
+                # Only encode the grid for steps whose frame the recorder keeps
+                frame = encode(grid) if recorder.needs_grid() else None
+                recorder.record(frame, [live_counts['a'], live_counts['b']])
+                continue
             snapshot = []
             for rr in range(rows):
                 snapshot.append([cell[:] for cell in grid[rr]])
             grid_history.append(snapshot)
 
+    if history != "full":
+        recorder.set_latest_grid(encode(grid))
+        return recorder
     return grid_history
 
 
+########################################
+# 3. Array-based Simple Grid World
+########################################
+# Cell codes for the int8 grid: 0 = empty, 1 = 'a', 2 = 'b'
+EMPTY, TYPE_A, TYPE_B = 0, 1, 2
+CELL_SYMBOLS = np.array(['.', 'a', 'b'])
+
+# Lookup tables over the 4-bit free-neighbour code used by grid_world_step:
+# number of free neighbours, and the direction of the k-th free one
+_FREE_COUNT = np.array([bin(code).count('1') for code in range(16)])
+_KTH_FREE_DIRECTION = np.array([
+    ([d for d in range(4) if code >> d & 1] + [0] * 4)[:4] for code in range(16)
+], dtype=np.intp)
+# Directions (0 = up, 1 = down, 2 = left, 3 = right) in order of placement priority
+_PLACEMENT_ORDER = (1, 3, 2, 0)
+
+def random_array_grid(rows, cols, initial_fill=0.2, rng=None):
+    """Fill a fraction of an int8 grid with random 'a'/'b' agents, like run_simple_grid_world."""
+    rng = np.random.default_rng(rng)
+    grid = np.zeros((rows, cols), dtype=np.int8)
+    num_to_fill = int(rows * cols * initial_fill)
+    cells = rng.permutation(rows * cols)[:num_to_fill]
+    grid.flat[cells] = rng.integers(TYPE_A, TYPE_B + 1, size=num_to_fill)
+    return grid
+
+def decode_grid(grid):
+    """Convert an int8 grid back to nested lists of '.', 'a' and 'b'."""
+    return CELL_SYMBOLS[grid].tolist()
+
+def encode_grid(grid):
+    """Convert nested lists of '.', 'a' and 'b' to an int8 grid."""
+    cells = np.array(grid)
+    return ((cells == 'a') * TYPE_A + (cells == 'b') * TYPE_B).astype(np.int8)
+
+def encode_stacked_grid(grid):
+    """Convert nested lists of agent lists to a (rows, cols, 2) array of 'a' and 'b' counts."""
+    return np.array([[(cell.count('a'), cell.count('b')) for cell in row] for row in grid],
+                    dtype=np.int64).reshape(len(grid), len(grid[0]), 2)
+
+def bernoulli_indices(n, p, rng):
+    """
+    Sorted indices in range(n), each included independently with probability p.
+
+    Gaps between selected indices are geometric, so the cost is proportional to
+    the number selected (about n * p) rather than to n.
+    """
+    if p <= 0.0:
+        return np.empty(0, dtype=np.intp)
+    if p >= 1.0:
+        return np.arange(n)
+    log_q = np.log1p(-p)
+
+    def gaps(size):
+        # Geometric(p) draws by inversion, faster than rng.geometric
+        return np.floor(np.log(1.0 - rng.random(size)) / log_q).astype(np.intp) + 1
+
+    expected = n * p
+    indices = np.cumsum(gaps(int(expected + 5 * np.sqrt(expected) + 16))) - 1
+    while indices[-1] < n:
+        indices = np.concatenate([indices, indices[-1] + np.cumsum(gaps(int(expected) // 10 + 16))])
+    return indices[:np.searchsorted(indices, n)]
+
+def grid_world_step(grid, rng, reproduction_prob=0.1, mutation_rate=0.0, death_prob=0.0):
+    """
+    Advance a single-occupancy int8 grid by one timestep in place.
+
+    Same rules as the non-stacked branch of run_simple_grid_world, drawn in bulk:
+    every agent reproduces with probability `reproduction_prob` into a uniformly
+    chosen neighbour that was empty at the start of the step, the offspring may
+    mutate, and when several offspring target the same cell the one whose parent
+    comes first in row-major order wins. Then every agent dies with probability
+    `death_prob`.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        C-contiguous int8 array of shape (rows, cols), modified in place. A
+        sliced or transposed grid is rejected, since its flat view would be a
+        copy and the step would be lost; pass np.ascontiguousarray(grid).
+    rng : numpy.random.Generator
+        Random generator used for all draws.
+
+    Returns
+    -------
+    born, died : np.ndarray
+        Flat indices of the cells that received an offspring and of the cells
+        whose agent died this step (a newborn may appear in both).
+    born_types, died_types : np.ndarray
+        The cell codes of those newborns and of the agents that died.
+    """
+    if not grid.flags.c_contiguous:
+        raise ValueError("grid must be C-contiguous to be updated in place")
+    rows, cols = grid.shape
+    flat = grid.reshape(-1)  # A view, so writes to flat update grid
+
+    # Agents that try to reproduce, in row-major order
+    candidates = bernoulli_indices(flat.size, reproduction_prob, rng)
+    parents = candidates[flat[candidates] != EMPTY]
+    r, c = np.divmod(parents, cols)
+
+    # 4-bit code of which neighbours were free at the start of the step, in
+    # get_neighbors order (bit 0 = up, 1 = down, 2 = left, 3 = right); indices
+    # are clipped so wall cells read a valid entry and are masked out
+    up = (r > 0) & (flat[np.maximum(parents - cols, 0)] == EMPTY)
+    down = (r < rows - 1) & (flat[np.minimum(parents + cols, flat.size - 1)] == EMPTY)
+    left = (c > 0) & (flat[np.maximum(parents - 1, 0)] == EMPTY)
+    right = (c < cols - 1) & (flat[np.minimum(parents + 1, flat.size - 1)] == EMPTY)
+    code = up.view(np.uint8) | down.view(np.uint8) << 1 | left.view(np.uint8) << 2 | right.view(np.uint8) << 3
+    has_free = code > 0
+    parents, code = parents[has_free], code[has_free]
+
+    # Pick the k-th free neighbour of every parent, k uniform in [0, n_free)
+    k = (rng.random(parents.size) * _FREE_COUNT[code]).astype(np.intp)
+    direction = _KTH_FREE_DIRECTION[code, k]
+    targets = parents + np.array([-cols, cols, -1, 1])[direction]
+
+    offspring_types = flat[parents]
+    if mutation_rate > 0.0:
+        mutate = rng.random(parents.size) < mutation_rate
+        offspring_types = np.where(mutate, TYPE_A + TYPE_B - offspring_types, offspring_types).astype(np.int8)
+
+    # First placed wins. A target can only be contested by the parents above, left,
+    # right and below it, which come in that row-major order; those parents moved
+    # down, right, left and up. Placing direction groups in that order and skipping
+    # cells already filled gives the same winners as placing parent by parent.
+    born, born_types = [], []
+    for d in _PLACEMENT_ORDER:
+        group = direction == d
+        group_targets = targets[group]
+        wins = flat[group_targets] == EMPTY
+        born.append(group_targets[wins])
+        born_types.append(offspring_types[group][wins])
+        flat[born[-1]] = born_types[-1]
+    born = np.concatenate(born)
+    born_types = np.concatenate(born_types)
+
+    if death_prob > 0.0:
+        candidates = bernoulli_indices(flat.size, death_prob, rng)
+        died = candidates[flat[candidates] != EMPTY]
+        died_types = flat[died]
+        flat[died] = EMPTY
+    else:
+        died = np.empty(0, dtype=np.intp)
+        died_types = np.empty(0, dtype=np.int8)
+
+    return born, born_types, died, died_types
+
+def run_grid_world_array(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
+                         timesteps=10, mutation_rate=0.0, death_prob=0.0, rng=None,
+                         history="full", stride=1):
+    """
+    Run the single-occupancy simple grid world on an int8 NumPy grid.
+
+    Vectorized counterpart of run_simple_grid_world(allow_multiple=False); see
+    grid_world_step for the update rules.
+
+    Parameters
+    ----------
+    rows, cols, initial_fill, reproduction_prob, timesteps, mutation_rate, death_prob
+        As for run_simple_grid_world.
+    rng : numpy.random.Generator, int or None
+        Random generator or seed.
+    history : str
+        What to keep of the run: 'full', 'strided', 'delta', 'counts' or 'none'
+        (see GridHistory).
+    stride : int
+        Snapshot interval for history='strided'.
+
+    Returns
+    -------
+    grid_history : GridHistory
+        The recorded run; grids are int8 (0 = empty, 1 = 'a', 2 = 'b'), see decode_grid.
+    """
+    rng = np.random.default_rng(rng)
+    grid = random_array_grid(rows, cols, initial_fill, rng)
+    counts = np.bincount(grid.ravel(), minlength=3)[TYPE_A:].astype(np.int64)
+    grid_history = GridHistory(grid, counts, timesteps, mode=history, stride=stride)
+    for _ in range(timesteps):
+        born, born_types, died, died_types = grid_world_step(
+            grid, rng, reproduction_prob, mutation_rate, death_prob)
+        counts += np.bincount(born_types, minlength=3)[TYPE_A:]
+        counts -= np.bincount(died_types, minlength=3)[TYPE_A:]
+        grid_history.record(grid, counts, changed=np.concatenate([born, died]))
+    return grid_history
+
+
+########################################
+# 4. Count-array Stacked Grid World
+########################################
+def random_stacked_grid(rows, cols, initial_fill=0.2, rng=None):
+    """Initial (rows, cols, 2) count grid: one random 'a' or 'b' agent in a fraction of the cells."""
+    grid = random_array_grid(rows, cols, initial_fill, rng)
+    counts = np.zeros((rows, cols, 2), dtype=np.int64)
+    counts[..., 0] = grid == TYPE_A
+    counts[..., 1] = grid == TYPE_B
+    return counts
+
+def stacked_grid_step(counts, rng, reproduction_prob=0.1, mutation_rate=0.0, death_prob=0.0):
+    """
+    Advance a stacked grid of agent counts by one timestep in place.
+
+    counts[r, c] holds the number of 'a' and 'b' agents in cell (r, c). Each agent
+    reproduces with probability `reproduction_prob`, its offspring mutates with
+    probability `mutation_rate` and moves to a uniformly chosen orthogonal neighbour,
+    and the agent dies with probability `death_prob`. All of this is binomial draws
+    per cell and type, with offspring split over the valid neighbours by sequential
+    binomials (a multinomial), so the cost does not depend on how many agents share
+    a cell.
+
+    Cells act in the same order as the list-based allow_multiple branch of
+    run_simple_grid_world, which visits them row by row: offspring moved down or
+    right land in a cell that has not acted yet and act in the same step, while
+    offspring moved up or left only act in the next one. A cell depends only on
+    its upper and left neighbours, so the sweep goes over anti-diagonals, one
+    vectorised update per diagonal, and matches that branch in distribution.
+
+    Returns
+    -------
+    born, died : np.ndarray
+        Number of offspring placed and agents that died this step, per type (a, b).
+    """
+    rows, cols, _ = counts.shape
+    born = np.zeros(2, dtype=np.int64)
+    died = np.zeros(2, dtype=np.int64)
+    for k in range(rows + cols - 1):
+        # Cells (r, c) with r + c == k; their upper and left neighbours are on diagonal k - 1
+        r = np.arange(max(0, k - cols + 1), min(rows - 1, k) + 1)
+        c = k - r
+        present = counts[r, c]
+        offspring = rng.binomial(present, reproduction_prob)
+        if mutation_rate > 0.0:
+            mutated = rng.binomial(offspring, mutation_rate)
+            offspring += mutated[:, ::-1] - mutated
+        if death_prob > 0.0:
+            deaths = rng.binomial(present, death_prob)
+            counts[r, c] -= deaths
+            died += deaths.sum(axis=0)
+
+        # Valid moves up, down, left and right from each cell of the diagonal
+        moves = [(r > 0, -1, 0), (r < rows - 1, 1, 0), (c > 0, 0, -1), (c < cols - 1, 0, 1)]
+        remaining_directions = sum(valid.astype(np.int64) for valid, _, _ in moves)
+        for valid, dr, dc in moves:
+            # Give this direction its share of what is left: Bin(n, 1 / directions left)
+            share = np.divide(valid, remaining_directions, out=np.zeros(len(r)),
+                              where=remaining_directions > 0)
+            moved = rng.binomial(offspring, share[:, None])
+            offspring -= moved
+            remaining_directions -= valid
+            counts[r[valid] + dr, c[valid] + dc] += moved[valid]
+            born += moved.sum(axis=0)
+
+    return born, died
+
+def run_stacked_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1,
+                           timesteps=10, mutation_rate=0.0, death_prob=0.0, rng=None,
+                           history="full", stride=1):
+    """
+    Run the multiple-occupancy simple grid world on a (rows, cols, 2) count array.
+
+    Count-based counterpart of run_simple_grid_world(allow_multiple=True); see
+    stacked_grid_step for the update rules.
+
+    Parameters
+    ----------
+    rows, cols, initial_fill, reproduction_prob, timesteps, mutation_rate, death_prob
+        As for run_simple_grid_world.
+    rng : numpy.random.Generator, int or None
+        Random generator or seed.
+    history : str
+        What to keep of the run: 'full', 'strided', 'delta', 'counts' or 'none'
+        (see GridHistory).
+    stride : int
+        Snapshot interval for history='strided'.
+
+    Returns
+    -------
+    grid_history : GridHistory
+        The recorded run; grids hold the number of 'a' and 'b' agents in every cell.
+    """
+    rng = np.random.default_rng(rng)
+    grid = random_stacked_grid(rows, cols, initial_fill, rng)
+    counts = grid.sum(axis=(0, 1))
+    grid_history = GridHistory(grid, counts, timesteps, mode=history, stride=stride)
+    for _ in range(timesteps):
+        born, died = stacked_grid_step(grid, rng, reproduction_prob, mutation_rate, death_prob)
+        counts += born - died
+        grid_history.record(grid, counts)
+    return grid_history
+
+
+########################################
+# 5. Grid History
+########################################
+HISTORY_MODES = ("full", "strided", "delta", "counts", "none")
+
+class GridHistory:
+    """
+    History of a grid world run, kept according to `mode`.
+
+    - 'full': a copy of the grid at every timestep.
+    - 'strided': a copy every `stride` timesteps (plus the initial grid).
+    - 'delta': the initial grid and, for each timestep, the indices and new values
+      of the cells that changed; a full keyframe is stored every `keyframe_every`
+      steps so any step can be rebuilt quickly with grid_at.
+    - 'counts': only the number of 'a' and 'b' agents at each timestep.
+    - 'none': nothing but the latest grid and counts.
+
+    Counts are supplied by the engine, which updates them from births and deaths
+    instead of rescanning the grid, and are recorded in every mode except 'none'.
+    Grids are int8 cell codes (single occupancy) or (rows, cols, 2) counts (stacked).
+    """
+
+    def __init__(self, grid, counts, timesteps, mode="full", stride=1, keyframe_every=100):
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"mode must be one of {HISTORY_MODES}, got {mode!r}")
+        self.mode = mode
+        self.stride = 1 if mode == "full" else stride
+        self.keyframe_every = keyframe_every
+        self.steps = 0
+        self.latest_grid = grid
+        self.latest_counts = np.array(counts, dtype=np.int64)
+        self._counts = None
+        if mode != "none":
+            self._counts = np.zeros((timesteps + 1, 2), dtype=np.int64)
+            self._counts[0] = counts
+        self._snapshots = {}
+        if mode in ("full", "strided", "delta"):
+            self._snapshots[0] = grid.copy()
+        self._deltas = []
+        self._previous_cells = None
+
+    def record(self, grid, counts, changed=None):
+        """
+        Record the state after one more timestep.
+
+        `changed` may list the flat indices of cells that might have changed; in
+        'delta' mode it is otherwise found by comparing with the previous grid.
+        grid may be None when needs_grid() is False; set the final grid with
+        set_latest_grid once the run is over.
+        """
+        self.steps += 1
+        t = self.steps
+        if grid is not None:
+            self.latest_grid = grid
+        self.latest_counts = np.array(counts, dtype=np.int64)
+        if self._counts is not None:
+            self._counts[t] = counts
+        if self.mode in ("full", "strided") and t % self.stride == 0:
+            self._snapshots[t] = grid.copy()
+        elif self.mode == "delta":
+            cells = grid.reshape(grid.shape[0] * grid.shape[1], -1)
+            if changed is None:
+                if self._previous_cells is None:
+                    self._previous_cells = self._snapshots[0].reshape(cells.shape).copy()
+                changed = np.flatnonzero((cells != self._previous_cells).any(axis=1))
+                self._previous_cells[changed] = cells[changed]
+            self._deltas.append((changed.astype(np.int64), cells[changed].copy()))
+            if t % self.keyframe_every == 0:
+                self._snapshots[t] = grid.copy()
+
+    def needs_grid(self):
+        """Whether the next record() call stores the grid (so an engine can skip building it)."""
+        t = self.steps + 1
+        return self.mode == "delta" or (self.mode in ("full", "strided") and t % self.stride == 0)
+
+    def set_latest_grid(self, grid):
+        """Set the grid after the last recorded step, for runs that recorded with grid=None."""
+        self.latest_grid = grid
+
+    def __len__(self):
+        return self.steps + 1
+
+    @property
+    def counts(self):
+        """(timesteps + 1, 2) array of 'a' and 'b' counts at every timestep."""
+        if self._counts is None:
+            raise ValueError("counts are not recorded in 'none' mode")
+        return self._counts[:self.steps + 1]
+
+    @property
+    def snapshot_steps(self):
+        """Timesteps for which a full copy of the grid is stored."""
+        return sorted(self._snapshots)
+
+    def grid_at(self, t):
+        """Return the grid at timestep t, rebuilding it from deltas in 'delta' mode."""
+        if t < 0:
+            t += len(self)
+        if t == self.steps:
+            return self.latest_grid.copy()
+        if t in self._snapshots:
+            return self._snapshots[t].copy()
+        if self.mode != "delta" or not 0 <= t <= self.steps:
+            raise KeyError(f"timestep {t} is not available in {self.mode!r} mode")
+        start = max(step for step in self._snapshots if step <= t)
+        grid = self._snapshots[start].copy()
+        cells = grid.reshape(grid.shape[0] * grid.shape[1], -1)
+        for indices, values in self._deltas[start:t]:
+            cells[indices] = values
+        return grid
+
+    def to_array(self):
+        """Stack the stored snapshots into one array, in the order of snapshot_steps."""
+        return np.stack([self._snapshots[t] if t != self.steps else self.latest_grid
+                         for t in self.snapshot_steps])
+
+
 ########################################
 # Example Usage
 ########################################
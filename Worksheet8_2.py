@@ -1,21 +1,24 @@
-import random
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from Worksheet8 import run_count_model, run_grid_world_array, uniform_stream
 
 ############################
 # 1. List of Agents Model
 ############################
 
-def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0):
+def run_list_of_agents_model(initial_population, timesteps, mutation_rate=0.0, rng=None):
+    rng = np.random.default_rng(rng)
     population = initial_population[:]
     population_history = [population]
 
     for _ in range(timesteps):
+        mutations = (rng.random(len(population)) < mutation_rate).tolist()
         new_population = []
-        for agent in population:
+        for agent, mutates in zip(population, mutations):
             # Parent reproduces an identical offspring (with possible mutation)
             offspring_type = agent
-            if random.random() < mutation_rate:
+            if mutates:
                 offspring_type = 'a' if agent == 'b' else 'b'
             # Add both parent and offspring to the next generation
             new_population.append(agent)
@@ -36,15 +39,18 @@ def get_neighbors(r, c, rows, cols):
             neighbors.append((nr, nc))
     return neighbors
 
-def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1, timesteps=10, mutation_rate=0.0):
+def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1, timesteps=10, mutation_rate=0.0,
+                          rng=None):
     # Initialize grid
+    rng = np.random.default_rng(rng)
+    uniforms = uniform_stream(rng)
     grid = [['.' for _ in range(cols)] for _ in range(rows)]
     num_to_fill = int(rows*cols*initial_fill)
     all_positions = [(r,c) for r in range(rows) for c in range(cols)]
-    random.shuffle(all_positions)
+    rng.shuffle(all_positions)
     for i in range(num_to_fill):
         r, c = all_positions[i]
-        grid[r][c] = random.choice(['a','b'])
+        grid[r][c] = 'ab'[int(next(uniforms) * 2)]
 
     grid_history = []
     grid_history.append([row[:] for row in grid])
@@ -54,13 +60,13 @@ def run_simple_grid_world(rows, cols, initial_fill=0.2, reproduction_prob=0.1, t
         for r in range(rows):
             for c in range(cols):
                 if grid[r][c] in ['a','b']:
-                    if random.random() < reproduction_prob:
+                    if next(uniforms) < reproduction_prob:
                         nbrs = get_neighbors(r,c, rows, cols)
                         free_nbrs = [(nr, nc) for (nr,nc) in nbrs if grid[nr][nc] == '.']
                         if free_nbrs:
-                            nr, nc = random.choice(free_nbrs)
+                            nr, nc = free_nbrs[int(next(uniforms) * len(free_nbrs))]
                             new_type = grid[r][c]
-                            if random.random() < mutation_rate:
+                            if next(uniforms) < mutation_rate:
                                 new_type = 'b' if new_type == 'a' else 'a'
                             offspring_positions.append((nr, nc, new_type))
         # Place offspring
@@ -89,77 +95,126 @@ def count_types_in_grid(grid):
         b_count += row.count('b')
     return a_count, b_count
 
-# Parameters
-timesteps = 20
-
-### Run List of Agents Model
-initial_population = ['a']  # start with only 'a'
-mutation_rate = 0.05
-loam_history = run_list_of_agents_model(initial_population, timesteps, mutation_rate)
-
-loam_a = []
-loam_b = []
-loam_total = []
-for pop in loam_history:
-    a_count, b_count = count_types_in_list(pop)
-    loam_a.append(a_count)
-    loam_b.append(b_count)
-    loam_total.append(a_count + b_count)
-
-# Theoretical expectation for list of agents model:
-# p_{t+1} = 2 p_t -> exponential growth.
-# If starting with p_0 = 1, then p_t = 2^t
-# Let's produce a theoretical curve:
-t_points = np.arange(timesteps+1)
-theoretical_loam = 2**t_points  # no mutation scenario
-
-### Run Simple Grid World Model
-rows, cols = 20, 20
-gw_history = run_simple_grid_world(rows, cols, initial_fill=0.05, reproduction_prob=0.1, timesteps=timesteps, mutation_rate=0.05)
-
-gw_a = []
-gw_b = []
-gw_total = []
-for g in gw_history:
-    a_count, b_count = count_types_in_grid(g)
-    gw_a.append(a_count)
-    gw_b.append(b_count)
-    gw_total.append(a_count + b_count)
-
-# Theoretical expectation for simple grid world:
-# logistic growth: dp/dt = r p (1 - p/K), with K = rows * cols
-K = rows * cols
-# Approximate discrete logistic:
-# p_{t+1} ~ p_t + r p_t (1 - p_t/K)
-# For illustration, let's pick r ~ 0.1 (based on reproduction_prob)
-r = 0.1
-theoretical_gw = [gw_total[0]]
-for i in range(1, timesteps+1):
-    p_prev = theoretical_gw[-1]
-    p_next = p_prev + r * p_prev * (1 - p_prev/K)
-    theoretical_gw.append(p_next)
-
-
-### Plot Results
-plt.figure(figsize=(12,5))
-
-# List of Agents Model - ABM vs Theory
-plt.subplot(1,2,1)
-plt.plot(t_points, loam_total, 'o-', label='ABM total')
-plt.plot(t_points, theoretical_loam, 'r--', label='Theory (Exponential)')
-plt.xlabel("Time")
-plt.ylabel("Population Size")
-plt.title("List of Agents Model")
-plt.legend()
-
-# Simple Grid World - ABM vs Theory
-plt.subplot(1,2,2)
-plt.plot(t_points, gw_total, 'o-', label='ABM total')
-plt.plot(t_points, theoretical_gw, 'r--', label='Theory (Logistic Approx.)')
-plt.xlabel("Time")
-plt.ylabel("Population Size")
-plt.title("Simple Grid World Model")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
+############################
+# Ensembles of Replicates
+############################
+
+def run_replicate(seed, timesteps, initial_population, mutation_rate, rows, cols,
+                  initial_fill, reproduction_prob):
+    # One replicate of both models, fully determined by its seed
+    rng = np.random.default_rng(seed)
+    list_total = run_count_model(initial_population, timesteps, mutation_rate, rng=rng).sum(axis=1)
+    grid_total = run_grid_world_array(rows, cols, initial_fill, reproduction_prob, timesteps,
+                                      mutation_rate, rng=rng, history="counts").counts.sum(axis=1)
+    return list_total, grid_total
+
+def summarize_runs(runs, quantiles):
+    # Mean and quantile band over replicates (axis 0) at every timestep
+    lower, upper = np.quantile(runs, quantiles, axis=0)
+    return {'runs': runs, 'mean': runs.mean(axis=0), 'lower': lower, 'upper': upper}
+
+def run_ensemble(replicates, timesteps, initial_population=('a',), mutation_rate=0.05,
+                 rows=20, cols=20, initial_fill=0.05, reproduction_prob=0.1,
+                 seed=0, processes=None, quantiles=(0.05, 0.95)):
+    """
+    Run `replicates` independent copies of the list and grid models and aggregate them.
+
+    Each replicate gets its own SeedSequence child of `seed`, so results do not depend
+    on how replicates are spread over the process pool (processes=1 runs them inline).
+    Returns {'list': ..., 'grid': ...}, each a dict of arrays of length timesteps + 1:
+    'mean', 'lower' and 'upper' (the quantile band), plus all totals in 'runs'.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    args = (timesteps, list(initial_population), mutation_rate, rows, cols,
+            initial_fill, reproduction_prob)
+    if processes == 1:
+        results = [run_replicate(s, *args) for s in seeds]
+    else:
+        chunksize = max(1, replicates // (4 * (processes or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(run_replicate, seeds, *([a] * replicates for a in args),
+                                    chunksize=chunksize))
+    list_runs = np.array([r[0] for r in results])
+    grid_runs = np.array([r[1] for r in results])
+    return {'list': summarize_runs(list_runs, quantiles), 'grid': summarize_runs(grid_runs, quantiles)}
+
+def discrete_logistic(p0, r, K, timesteps):
+    # p_{t+1} = p_t + r p_t (1 - p_t/K)
+    p = np.empty(timesteps + 1)
+    p[0] = p0
+    for t in range(timesteps):
+        p[t + 1] = p[t] + r * p[t] * (1 - p[t] / K)
+    return p
+
+def fit_logistic(population, r_guess=0.1, K_guess=None):
+    """Least-squares fit of the discrete logistic r and K to a population curve (e.g. an ensemble mean)."""
+    from scipy.optimize import least_squares
+
+    population = np.asarray(population, dtype=float)
+    timesteps = len(population) - 1
+    if K_guess is None:
+        K_guess = 2 * population.max()
+
+    def residuals(params):
+        return discrete_logistic(population[0], params[0], params[1], timesteps) - population
+
+    fit = least_squares(residuals, [r_guess, K_guess], bounds=([0, population.max()], [np.inf, np.inf]))
+    return fit.x[0], fit.x[1]
+
+def main():
+    # Parameters
+    timesteps = 20
+    replicates = 200
+    initial_population = ['a']  # start with only 'a'
+    mutation_rate = 0.05
+    rows, cols = 20, 20
+
+    ### Run both models as an ensemble of replicates
+    ensemble = run_ensemble(replicates, timesteps, initial_population, mutation_rate,
+                            rows=rows, cols=cols, initial_fill=0.05, reproduction_prob=0.1)
+    loam = ensemble['list']
+    gw = ensemble['grid']
+
+    # Theoretical expectation for list of agents model:
+    # p_{t+1} = 2 p_t -> exponential growth.
+    # If starting with p_0 = 1, then p_t = 2^t
+    t_points = np.arange(timesteps+1)
+    theoretical_loam = 2**t_points  # no mutation scenario
+
+    # Theoretical expectation for simple grid world:
+    # logistic growth: dp/dt = r p (1 - p/K), with K up to rows * cols
+    # Fit the discrete logistic p_{t+1} ~ p_t + r p_t (1 - p_t/K) to the ensemble mean
+    r, K = fit_logistic(gw['mean'], r_guess=0.1, K_guess=rows * cols)
+    print(f"Fitted logistic: r = {r:.4f}, K = {K:.1f}")
+    theoretical_gw = discrete_logistic(gw['mean'][0], r, K, timesteps)
+
+    ### Plot Results
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12,5))
+
+    # List of Agents Model - ABM vs Theory
+    plt.subplot(1,2,1)
+    plt.fill_between(t_points, loam['lower'], loam['upper'], alpha=0.3, label='ABM 5-95%')
+    plt.plot(t_points, loam['mean'], 'o-', label='ABM mean')
+    plt.plot(t_points, theoretical_loam, 'r--', label='Theory (Exponential)')
+    plt.xlabel("Time")
+    plt.ylabel("Population Size")
+    plt.title("List of Agents Model")
+    plt.legend()
+
+    # Simple Grid World - ABM vs Theory
+    plt.subplot(1,2,2)
+    plt.fill_between(t_points, gw['lower'], gw['upper'], alpha=0.3, label='ABM 5-95%')
+    plt.plot(t_points, gw['mean'], 'o-', label='ABM mean')
+    plt.plot(t_points, theoretical_gw, 'r--', label=f'Theory (Logistic fit, r={r:.3f}, K={K:.0f})')
+    plt.xlabel("Time")
+    plt.ylabel("Population Size")
+    plt.title("Simple Grid World Model")
+    plt.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
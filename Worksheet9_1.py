@@ -1,5 +1,5 @@
+import hashlib
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Constants
 GRID_SIZE = 4
@@ -7,9 +7,9 @@ NUM_STATES = 7
 NUM_UPDATES = 4
 
 def initialize_grid(grid_size, num_states, seed=42):
-    """Initialize the grid with random states."""
-    np.random.seed(seed)
-    return np.random.choice(num_states, size=(grid_size, grid_size))
+    """Initialize the grid with random states; seed is an int, SeedSequence or Generator."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(num_states, size=(grid_size, grid_size))
 
 def print_grid(grid, title=None):
     """Print the current grid state."""
@@ -18,8 +18,69 @@ def print_grid(grid, title=None):
     for row in grid:
         print(" ".join(map(str, row)))
 
-def apply_diffusion(grid):
-    """Apply diffusion by averaging states with neighbors."""
+def neighbor_counts(shape):
+    """Number of in-grid orthogonal neighbours of every cell of a (rows, cols) grid."""
+    counts = np.full(shape, 4.0)
+    counts[0, :] -= 1
+    counts[-1, :] -= 1
+    counts[:, 0] -= 1
+    counts[:, -1] -= 1
+    return counts
+
+class Diffusion:
+    """Rounded-average diffusion on preallocated buffers; works on (H, W) or stacked (..., H, W) grids."""
+
+    def __init__(self, shape, dtype=int):
+        self.shape = shape
+        self.dtype = dtype
+        self.counts = neighbor_counts(shape[-2:])
+        self.sums = np.empty(shape)
+        self._buffers = None
+
+    @property
+    def buffers(self):
+        """The two grids run alternates between, allocated on first use."""
+        if self._buffers is None:
+            self._buffers = (np.empty(self.shape, dtype=self.dtype), np.empty(self.shape, dtype=self.dtype))
+        return self._buffers
+
+    def apply(self, grid, out):
+        """Write the diffused grid into out (which must not be grid)."""
+        sums = self.sums
+        # Top, bottom, left and right neighbours via shifted slices
+        sums[..., 0, :] = 0.0
+        sums[..., 1:, :] = grid[..., :-1, :]
+        np.add(sums[..., :-1, :], grid[..., 1:, :], out=sums[..., :-1, :])
+        np.add(sums[..., :, 1:], grid[..., :, :-1], out=sums[..., :, 1:])
+        np.add(sums[..., :, :-1], grid[..., :, 1:], out=sums[..., :, :-1])
+        np.divide(sums, self.counts, out=sums)
+        np.round(sums, out=sums)
+        np.copyto(out, sums, casting='unsafe')
+        return out
+
+    def run(self, grid, num_updates):
+        """Apply num_updates diffusion steps, swapping between the two buffers."""
+        current, spare = self.buffers
+        current[...] = grid
+        for _ in range(num_updates):
+            self.apply(current, spare)
+            current, spare = spare, current
+        return current.copy()
+
+def apply_diffusion(grid, out=None, diffusion=None):
+    """
+    Apply diffusion by averaging states with neighbors. Scratch space is allocated per
+    call unless a Diffusion for grid's shape is passed (its sums buffer is then reused,
+    so it must not be shared between threads); out may be an int array to write into.
+    """
+    if diffusion is None:
+        diffusion = Diffusion(grid.shape)
+    if out is None:
+        out = np.empty(grid.shape, dtype=int)
+    return diffusion.apply(grid, out)
+
+def apply_diffusion_loop(grid):
+    """Reference cell-by-cell version of apply_diffusion."""
     new_grid = grid.astype(float).copy()
     for i in range(grid.shape[0]):
         for j in range(grid.shape[1]):
@@ -33,13 +94,111 @@ def apply_diffusion(grid):
             new_grid[i, j] = np.mean(neighbors)
     return np.round(new_grid).astype(int)
 
+def state_counts(grid, num_states):
+    """
+    Number of cells in each state 0 .. num_states - 1 in one bincount pass. Like comparing
+    with every state, cells holding anything else (negative, fractional or too large
+    values, from float or int grids) are not counted.
+    """
+    values = np.asarray(grid).ravel()
+    if values.dtype.kind in 'iu':
+        states = values.astype(np.intp, copy=False)
+        valid = (states >= 0) & (states < num_states)
+    else:
+        with np.errstate(invalid='ignore'):
+            states = values.astype(np.intp)
+        valid = (states == values) & (states >= 0) & (states < num_states)
+    if not valid.all():
+        states = states[valid]
+    return np.bincount(states, minlength=num_states)
+
 def calculate_probabilities(grid, num_states):
     """Calculate probabilities of each site state."""
-    probabilities = np.zeros(num_states)
-    flat_grid = grid.flatten()
-    for state in range(num_states):
-        probabilities[state] = np.sum(flat_grid == state) / flat_grid.size
-    return probabilities
+    return state_counts(grid, num_states) / grid.size
+
+class ProbabilityRecorder:
+    """Record state probabilities after each update into a preallocated (updates, states) array."""
+
+    def __init__(self, num_updates, num_states):
+        self.num_states = num_states
+        self.probabilities = np.zeros((num_updates, num_states))
+        self.num_recorded = 0
+
+    def record(self, grid):
+        """Histogram the grid into the next row and return that row."""
+        row = self.probabilities[self.num_recorded]
+        row[:] = state_counts(grid, self.num_states)
+        row /= grid.size
+        self.num_recorded += 1
+        return row
+
+    @property
+    def recorded(self):
+        return self.probabilities[:self.num_recorded]
+
+def initialize_grids(grid_size, num_states, seeds):
+    """Stack one initialized grid per seed into a (batch, grid_size, grid_size) array."""
+    return np.stack([initialize_grid(grid_size, num_states, seed) for seed in seeds])
+
+def grid_digest(grid):
+    """Hash of a grid state, used to recognise states seen before."""
+    return hashlib.blake2b(np.ascontiguousarray(grid).tobytes(), digest_size=16).digest()
+
+def run_until_stable(grids, max_updates):
+    """
+    Diffuse one grid (H, W) or a batch (batch, H, W) for up to max_updates updates,
+    stopping each grid once it returns to an earlier state (a fixed point or a cycle)
+    and fast-forwarding it through the cycle to the state it would have at max_updates.
+
+    Returns a dict with the final 'grid' (same shape as the input) and per-grid
+    'cycle_start' (update at which the repeating state first appeared), 'period'
+    (1 for a fixed point) and 'detected_at' (update at which the repeat was seen);
+    all three are -1 for grids that did not repeat within max_updates.
+    """
+    grids = np.asarray(grids)
+    single = grids.ndim == 2
+    current = (grids[None] if single else grids).astype(int)
+    batch = len(current)
+
+    seen = [{grid_digest(current[b]): 0} for b in range(batch)]
+    cycle_start = np.full(batch, -1)
+    period = np.full(batch, -1)
+    detected_at = np.full(batch, -1)
+    operators = {}  # One Diffusion per sub-batch size, so buffers are reused
+
+    def diffuse(members):
+        if len(members) not in operators:
+            operators[len(members)] = Diffusion((len(members),) + current.shape[1:])
+        diffusion = operators[len(members)]
+        current[members] = diffusion.apply(current[members], diffusion.buffers[0])
+
+    active = np.arange(batch)
+    update = 0
+    while active.size and update < max_updates:
+        update += 1
+        diffuse(active)
+        for b in active:
+            digest = grid_digest(current[b])
+            if digest in seen[b]:
+                cycle_start[b] = seen[b][digest]
+                period[b] = update - cycle_start[b]
+                detected_at[b] = update
+            else:
+                seen[b][digest] = update
+        active = active[period[active] < 0]
+
+    # A grid that repeated at update t is in the state it had at cycle_start; stepping
+    # (max_updates - t) % period more updates gives its state at max_updates
+    remaining = np.where(period > 0, (max_updates - detected_at) % np.maximum(period, 1), 0)
+    for k in range(1, remaining.max(initial=0) + 1):
+        diffuse(np.flatnonzero(remaining >= k))
+
+    return {
+        'grid': current[0] if single else current,
+        'cycle_start': cycle_start,
+        'period': period,
+        'detected_at': detected_at,
+    }
 
 def display_probabilities(probabilities, update_num):
     """Display the probabilities of each state."""
@@ -49,6 +208,8 @@ def display_probabilities(probabilities, update_num):
 
 def visualize_grid(grid, title="Grid State"):
     """Visualize the grid state."""
+    import matplotlib.pyplot as plt
+
     plt.imshow(grid, cmap='viridis', interpolation='nearest', vmin=0, vmax=NUM_STATES-1)
     plt.title(title)
     plt.colorbar(label="Site State")
@@ -58,18 +219,32 @@ def main():
     # Initialize grid
     grid = initialize_grid(GRID_SIZE, NUM_STATES)
     print_grid(grid, title="Initial Grid")
-    
-    probabilities_over_time = []
+    initial_grid = grid
+
+    diffusion = Diffusion(grid.shape)
+    recorder = ProbabilityRecorder(NUM_UPDATES, NUM_STATES)
+    current, spare = diffusion.buffers
+    current[...] = grid
 
     # Perform updates
     for update in range(1, NUM_UPDATES + 1):
-        grid = apply_diffusion(grid)
-        probabilities = calculate_probabilities(grid, NUM_STATES)
-        probabilities_over_time.append(probabilities)
-        
-        print_grid(grid, title=f"Grid After Update {update}")
+        diffusion.apply(current, spare)
+        current, spare = spare, current
+        probabilities = recorder.record(current)
+
+        print_grid(current, title=f"Grid After Update {update}")
         display_probabilities(probabilities, update)
 
+    grid = current
+
+    # Long-run behaviour: stop as soon as the grid repeats a state
+    result = run_until_stable(initial_grid, max_updates=1000)
+    if result['period'][0] > 0:
+        print(f"\nGrid reaches a cycle of period {result['period'][0]} "
+              f"starting at update {result['cycle_start'][0]}")
+    else:
+        print("\nGrid did not repeat within 1000 updates")
+
     # Visualize final grid state
     visualize_grid(grid, title="Final Grid State")
 
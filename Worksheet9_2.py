@@ -1,6 +1,5 @@
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import odeint
 
 # Constants
 NUM_SPECIES = 6
@@ -8,31 +7,93 @@ SIMULATION_TIME = 50  # Total simulation time
 TIME_STEPS = 1000  # Number of time steps
 REACTION_RATES = np.ones(NUM_SPECIES)  # Reaction rates for each species
 
+def hypercycle_rhs(x, t, rates):
+    """Rate of change for each species; the number of species is len(rates)."""
+    # np.roll(x, 1)[i] is x[i-1], with species 0 fed by the last species
+    return x * (rates * np.roll(x, 1) - np.dot(rates, x))
+
+def hypercycle_jacobian(x, t, rates):
+    """Analytic Jacobian J[i, j] = d(dx_i/dt)/dx_j of hypercycle_rhs (odeint's Dfun)."""
+    species = np.arange(len(x))
+    jacobian = -np.outer(x, rates)
+    jacobian[species, species] += rates * np.roll(x, 1) - np.dot(rates, x)
+    jacobian[species, species - 1] += rates * x
+    return jacobian
+
+def integrate_hypercycle(initial_condition, time, rates=None):
+    """Integrate the hypercycle with odeint, using the analytic Jacobian."""
+    from scipy.integrate import odeint
+
+    if rates is None:
+        rates = np.ones(len(initial_condition))
+    return odeint(hypercycle_rhs, initial_condition, time, args=(rates,), Dfun=hypercycle_jacobian)
+
 def hypercycle_dynamics(x, t):
     """Compute the rate of change for each molecular species."""
-    dxdt = np.zeros(NUM_SPECIES)
-    total_interaction = np.sum(REACTION_RATES * x)
-    
-    for i in range(NUM_SPECIES):
-        prev_species = x[i-1] if i > 0 else x[-1]  # Circular dependency
-        dxdt[i] = x[i] * (REACTION_RATES[i] * prev_species - total_interaction)
-    
-    return dxdt
+    return hypercycle_rhs(x, t, REACTION_RATES)
+
+def hypercycle_rhs_ensemble(t, y, rates):
+    """Rate of change for M hypercycles flattened into one state vector of length M * len(rates)."""
+    x = y.reshape(-1, len(rates))
+    return (x * (rates * np.roll(x, 1, axis=1) - (x @ rates)[:, None])).ravel()
+
+def _integrate_chunk(initial_conditions, time, rates, method, rtol, atol):
+    from scipy.integrate import solve_ivp
+
+    solution = solve_ivp(hypercycle_rhs_ensemble, (time[0], time[-1]), initial_conditions.ravel(),
+                         method=method, t_eval=time, args=(rates,), rtol=rtol, atol=atol)
+    if not solution.success:
+        raise RuntimeError(solution.message)
+    # solve_ivp gives (M * species, T); return (M, T, species)
+    return solution.y.reshape(len(initial_conditions), -1, len(time)).transpose(0, 2, 1)
+
+def integrate_ensemble(initial_conditions, time, rates=None, method="RK45", rtol=1e-6, atol=1e-9,
+                       processes=1, chunk_size=1000):
+    """
+    Integrate M initial conditions (an (M, species) array) together.
+
+    Each chunk of up to chunk_size initial conditions is stacked into one flattened state
+    and solved in a single solve_ivp call; with processes > 1 the chunks are spread over
+    a process pool. Returns an (M, len(time), species) array.
+    """
+    initial_conditions = np.atleast_2d(np.asarray(initial_conditions, dtype=float))
+    time = np.asarray(time, dtype=float)
+    if rates is None:
+        rates = np.ones(initial_conditions.shape[1])
+    chunks = [initial_conditions[i:i + chunk_size] for i in range(0, len(initial_conditions), chunk_size)]
+    args = (time, rates, method, rtol, atol)
+    if processes == 1:
+        results = [_integrate_chunk(chunk, *args) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(_integrate_chunk, chunks, *([a] * len(chunks) for a in args)))
+    return np.concatenate(results)
+
+def sample_simplex(num_samples, num_species, rng=None):
+    """Draw initial conditions uniformly from the simplex (concentrations summing to 1)."""
+    return np.random.default_rng(rng).dirichlet(np.ones(num_species), size=num_samples)
+
+def normalization_drift(results):
+    """|sum of concentrations - 1| at every time step (works on (T, species) or (M, T, species))."""
+    return np.abs(results.sum(axis=-1) - 1.0)
 
 def check_normalization(results):
     """Check if concentrations sum to 1 at every time step."""
-    for i, step in enumerate(results):
-        total = np.sum(step)
-        if not np.isclose(total, 1.0, atol=1e-6):
-            print(f"Normalization issue at time step {i}: Total = {total:.6f}")
-            return
+    totals = results.sum(axis=-1)
+    issues = np.flatnonzero(~np.isclose(totals, 1.0, atol=1e-6))
+    if issues.size:
+        i = issues[0]
+        print(f"Normalization issue at time step {i}: Total = {totals[i]:.6f}")
+        return
     print("All time steps are normalized (sum to 1).")
 
 def plot_combined_results(time, results_list, titles):
     """Plot the concentration dynamics of molecular species in a single window."""
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(len(results_list), 1, figsize=(8, 10), sharex=True)  # Reduced size by 20%
     for i, (results, title) in enumerate(zip(results_list, titles)):
-        for species in range(NUM_SPECIES):
+        for species in range(results.shape[1]):
             axes[i].plot(time, results[:, species], label=f"Species {species + 1}")
         axes[i].set_title(title)
         axes[i].set_ylabel("Concentration")
@@ -53,16 +114,15 @@ def main():
     # Time vector
     time = np.linspace(0, SIMULATION_TIME, TIME_STEPS)
 
-    # Run simulations and collect results
-    results_list = []
-    for case, initial_condition in initial_conditions.items():
-        results = odeint(hypercycle_dynamics, initial_condition, time)
+    # Run all cases in one ensemble integration
+    cases = list(initial_conditions)
+    ensemble = integrate_ensemble(np.array(list(initial_conditions.values())), time, REACTION_RATES)
+    for case, results in zip(cases, ensemble):
         print(f"\n{case}:")
         check_normalization(results)
-        results_list.append((results, case))
 
     # Plot all cases in a single window
-    plot_combined_results(time, [res[0] for res in results_list], [res[1] for res in results_list])
+    plot_combined_results(time, list(ensemble), cases)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,270 @@
+"""
+Benchmark runner for the hot paths of the worksheets.
+
+Each benchmark is timed over a sweep of problem sizes; the results (and the log-log
+scaling exponent of each sweep) are written as JSON and can be compared against a
+saved baseline, so both slowdowns and changes in scaling behaviour show up.
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json --filter diffusion
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+BENCHMARKS = {}
+
+
+def benchmark(name, param, sizes, loops=None):
+    """
+    Register setup(size, rng) as a benchmark. setup builds fresh inputs from rng (a
+    Generator seeded with the size) and returns the zero-argument callable to time; it is
+    called again for every repeat. loops fixes the calls per repeat for benchmarks whose
+    state changes as they run (default: calibrated).
+    """
+    def register(setup):
+        BENCHMARKS[name] = {'setup': setup, 'param': param, 'sizes': sizes, 'loops': loops}
+        return setup
+    return register
+
+
+def random_positions(count, grid_size, rng):
+    return {divmod(int(cell), grid_size) for cell in rng.choice(grid_size * grid_size, size=count, replace=False)}
+
+
+@benchmark('calculate_empowerment', 'grid_size', (5, 10, 20, 40))
+def setup_calculate_empowerment(size, rng):
+    from Worksheet4_2 import calculate_empowerment
+    occupied = random_positions(size * size // 5, size, rng)
+    position = next((r, c) for r in range(size) for c in range(size) if (r, c) not in occupied)
+    return lambda: calculate_empowerment(position, size, occupied)
+
+
+@benchmark('vip_empowerment_policy', 'grid_size', (5, 10, 20, 40))
+def setup_vip_empowerment_policy(size, rng):
+    from Worksheet4_2 import vip_empowerment_policy
+    occupied = random_positions(size * size // 5 + 1, size, rng)
+    position = occupied.pop()
+    return lambda: vip_empowerment_policy(position, size, occupied, {'V': position}, rng=rng)
+
+
+@benchmark('antagonistic_policy', 'grid_size', (5, 10, 20, 40))
+def setup_antagonistic_policy(size, rng):
+    from Worksheet4_2 import antagonistic_policy
+    occupied = random_positions(size * size // 5 + 2, size, rng)
+    position, vip_position = occupied.pop(), occupied.pop()
+    return lambda: antagonistic_policy(position, size, occupied, {'V': vip_position}, rng=rng)
+
+
+@benchmark('gridworld_update_world', 'agents', (10, 20, 40, 80))
+def setup_gridworld_update_world(size, rng):
+    from Worksheet1_1 import Agent, GridWorld, move_clockwise, move_counterclockwise_diagonal, move_left
+    grid_size = 2 * size
+    behaviors = (move_clockwise, move_counterclockwise_diagonal, move_left)
+    agents = [Agent(str(i), position, behaviors[i % 3])
+              for i, position in enumerate(random_positions(size, grid_size, rng))]
+    world = GridWorld(grid_size, agents, [0] * size)
+    world.current_step = 1  # past the appearance step, so every agent moves
+    return world.update_world
+
+
+@benchmark('boid_update_position', 'boids', (10, 20, 40, 80))
+def setup_boid_update_position(size, rng):
+    from Worksheet6_2 import Boid
+    flock = [Boid(position, velocity)
+             for position, velocity in zip(rng.uniform(0, 100, (size, 2)), rng.uniform(-2, 2, (size, 2)))]
+
+    def step():
+        for boid in flock:
+            boid.update_position(flock)
+    return step
+
+
+@benchmark('sugarscape_update_world', 'size', (10, 20, 40, 80), loops=1)
+def setup_sugarscape_update_world(size, rng):
+    from Worksheet5 import Sugarscape
+    return Sugarscape(size=size, num_agents=size * size // 5, rng=rng).update_world
+
+
+@benchmark('social_bayesian_update', 'locations', (10, 100, 1000, 10000))
+def setup_social_bayesian_update(size, rng):
+    from Worksheet3_2 import TreasureHunter
+    hunter = TreasureHunter(size, rng=rng)
+    return lambda: hunter.social_bayesian_update(size // 2)
+
+
+@benchmark('run_simple_grid_world', 'rows', (10, 20, 40, 80))
+def setup_run_simple_grid_world(size, rng):
+    from Worksheet8 import run_simple_grid_world
+    return lambda: run_simple_grid_world(size, size, initial_fill=0.2, reproduction_prob=0.1, timesteps=5,
+                                         mutation_rate=0.01, death_prob=0.01, history="counts", rng=rng)
+
+
+@benchmark('apply_diffusion', 'grid_size', (16, 64, 256, 1024))
+def setup_apply_diffusion(size, rng):
+    from Worksheet9_1 import apply_diffusion
+    grid = rng.integers(0, 7, (size, size))
+    return lambda: apply_diffusion(grid)
+
+
+@benchmark('hypercycle_dynamics', 'time_points', (100, 1000, 10000))
+def setup_hypercycle_dynamics(size, rng):
+    from scipy.integrate import odeint
+    from Worksheet9_2 import NUM_SPECIES, hypercycle_dynamics
+    initial_condition = rng.dirichlet(np.ones(NUM_SPECIES))
+    time_points = np.linspace(0, size / 20, size)
+    return lambda: odeint(hypercycle_dynamics, initial_condition, time_points)
+
+
+@benchmark('alpha_beta', 'depth', (4, 5, 6, 7))
+def setup_alpha_beta(size, rng):
+    from gametheory import ArrayTree, alpha_beta
+    tree = ArrayTree.complete(size, 4, rng=rng).to_dict()
+    return lambda: alpha_beta(tree, size, float('-inf'), float('inf'), True)
+
+
+@benchmark('count_pi', 'samples', (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7))
+def setup_count_pi(size, rng):
+    from gametheory import count_pi
+    return lambda: count_pi(size)
+
+
+def time_benchmark(setup, size, loops=None, repeats=5, min_time=0.2):
+    """Seconds per call over `repeats` repeats, each of `loops` calls on freshly set-up inputs."""
+    rng = np.random.default_rng(size)
+    if loops is None:
+        # Calibrate like timeit.autorange, but aim for min_time spread over all repeats
+        function = setup(size, rng)
+        loops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                function()
+            if time.perf_counter() - start >= min_time / repeats:
+                break
+            loops *= 2
+    times = []
+    for _ in range(repeats):
+        function = setup(size, rng)
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        times.append((time.perf_counter() - start) / loops)
+    return {'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0, 'loops': loops, 'repeats': repeats}
+
+
+def scaling_exponent(sizes, seconds):
+    """Slope of log(time) against log(size): about 1 for linear, 2 for quadratic scaling."""
+    if len(sizes) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+
+def run(names, repeats=5, min_time=0.2, quick=False):
+    results, scaling = [], {}
+    for name in names:
+        spec = BENCHMARKS[name]
+        sizes = spec['sizes'][:2] if quick else spec['sizes']
+        medians = []
+        for size in sizes:
+            timing = time_benchmark(spec['setup'], size, spec['loops'], repeats, min_time)
+            results.append({'benchmark': name, 'param': spec['param'], 'size': size, **timing})
+            medians.append(timing['median'])
+            label = f"{spec['param']}={size}"
+            print(f"{name:<26} {label:<22} median {timing['median'] * 1e3:10.3f} ms"
+                  f"  (min {timing['min'] * 1e3:.3f} ms, {timing['loops']} loops x {repeats})", flush=True)
+        scaling[name] = scaling_exponent(sizes, medians)
+    return {'metadata': {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                         'python': platform.python_version(), 'numpy': np.__version__,
+                         'platform': platform.platform(), 'repeats': repeats, 'min_time': min_time},
+            'results': results, 'scaling': scaling}
+
+
+def compare(current, baseline, threshold=0.2, scaling_threshold=0.25):
+    """
+    Compare median times and scaling exponents against a baseline report. A benchmark
+    regresses if it is more than `threshold` (relative) slower at some size, or if its
+    scaling exponent grew by more than `scaling_threshold`. Returns the regressions.
+    """
+    previous = {(r['benchmark'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print(f"\n{'benchmark':<26} {'size':>10} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for result in current['results']:
+        key = (result['benchmark'], result['size'])
+        if key not in previous:
+            continue
+        ratio = result['median'] / previous[key]['median']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  SLOWER'
+            regressions.append({'benchmark': key[0], 'size': key[1], 'ratio': ratio})
+        elif ratio < 1 / (1 + threshold):
+            flag = '  faster'
+        print(f"{key[0]:<26} {key[1]:>10} {previous[key]['median'] * 1e3:>12.3f} "
+              f"{result['median'] * 1e3:>12.3f} {ratio:>7.2f}{flag}")
+
+    print(f"\n{'benchmark':<26} {'baseline exp':>12} {'current exp':>12}")
+    for name, exponent in current['scaling'].items():
+        old = baseline.get('scaling', {}).get(name)
+        if exponent is None or old is None:
+            continue
+        flag = ''
+        if exponent - old > scaling_threshold:
+            flag = '  WORSE SCALING'
+            regressions.append({'benchmark': name, 'scaling': exponent, 'baseline_scaling': old})
+        print(f"{name:<26} {old:>12.2f} {exponent:>12.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filter', '-k', action='append',
+                        help="only run benchmarks matching this glob (may be repeated)")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks and their sizes")
+    parser.add_argument('--output', '-o', help="write the JSON report to this file")
+    parser.add_argument('--compare', '-c', help="compare against a saved JSON report")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="relative slowdown counted as a regression (default 0.2)")
+    parser.add_argument('--scaling-threshold', type=float, default=0.25,
+                        help="scaling exponent increase counted as a regression (default 0.25)")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="approximate seconds spent timing each size (default 0.2)")
+    parser.add_argument('--quick', action='store_true', help="only the two smallest sizes of each sweep")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS
+             if not args.filter or any(fnmatch.fnmatch(name, f'*{pattern}*') for pattern in args.filter)]
+    if args.list:
+        for name in names:
+            print(f"{name:<26} {BENCHMARKS[name]['param']} in {BENCHMARKS[name]['sizes']}")
+        return 0
+    if not names:
+        parser.error("no benchmark matches the filter")
+
+    report = run(names, args.repeats, args.min_time, args.quick)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report['scaling'], indent=2))
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.scaling_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
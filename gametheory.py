@@ -1,76 +1,647 @@
+import multiprocessing
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
 def minimax( node , depth , maximizing_player ) :
-    if depth == 0 or not node [ 'children'] :
-        return node [ 'value']
-    if maximizing_player :
-        max_eval = float ( '-inf')
-        for child in node [ 'children'] :
-            eval = minimax ( child , depth - 1 , False )
-            max_eval = max ( max_eval , eval )
+    return iterative_minimax ( node , depth , maximizing_player )
+
+
+def alpha_beta (node , depth , alpha , beta , maximizing_player) :
+    return iterative_alpha_beta ( node , depth , alpha , beta , maximizing_player )
+
+# Transposition table entry flags: the stored value is exact, a lower bound or an upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def node_key(node):
+    """
+    Key identifying a node in the transposition table: its 'key' entry if it has one,
+    else its identity. Identity keys are only valid while the tree is alive (ids are
+    reused after garbage collection), so AlphaBetaSearch scopes them to one root.
+    """
+    return node.get('key', id(node))
+
+
+def static_value(node):
+    """Value of a node where the search stops; internal nodes without a value count as 0."""
+    value = node['value']
+    return 0 if value is None else value
+
+
+def _explicit_stack_search(node, depth, alpha, beta, maximizing_player, prune, return_pv):
+    """
+    Depth-first minimax (with alpha-beta cutoffs if prune) using an explicit stack.
+
+    Each ply is a frame in parallel preallocated lists (node, next child index, best
+    value, alpha, beta, player, best line), grown only if the tree is deeper than
+    expected, so there is no recursion and no recursion limit. Best lines are
+    (child index, rest of line) pairs sharing their tails, so recording a new best
+    move is O(1) and the principal variation is unrolled once at the end.
+    """
+    if depth == 0 or not node['children']:
+        return (node['value'], []) if return_pv else node['value']
+
+    size = min(depth, 64) + 1
+    nodes = [None] * size
+    next_child = [0] * size
+    best = [0] * size
+    alphas = [0] * size
+    betas = [0] * size
+    maximizing = [False] * size
+    lines = [None] * size
+
+    nodes[0] = node
+    best[0] = float('-inf') if maximizing_player else float('inf')
+    alphas[0], betas[0], maximizing[0] = alpha, beta, maximizing_player
+    sp = 0
+    while True:
+        children = nodes[sp]['children']
+        i = next_child[sp]
+        if i < len(children):
+            child = children[i]
+            if sp + 1 < depth and child['children']:
+                sp += 1
+                if sp == size:
+                    for frames in (nodes, next_child, best, alphas, betas, maximizing, lines):
+                        frames.extend(frames[:size])
+                    size *= 2
+                nodes[sp] = child
+                next_child[sp] = 0
+                maximizing[sp] = player = not maximizing[sp - 1]
+                best[sp] = float('-inf') if player else float('inf')
+                alphas[sp], betas[sp] = alphas[sp - 1], betas[sp - 1]
+                lines[sp] = None
+                continue
+            value, line = child['value'], None
+        else:
+            # All children done (or cut off): hand the frame's result to its parent
+            value, line = best[sp], lines[sp]
+            if sp == 0:
+                if not return_pv:
+                    return value
+                pv = []
+                while line is not None:
+                    i, line = line
+                    pv.append(i)
+                return value, pv
+            sp -= 1
+            i = next_child[sp]
+
+        # Comparisons rather than max/min keep the first of equal values, as max/min do
+        if maximizing[sp]:
+            if value > best[sp]:
+                best[sp] = value
+                if return_pv:
+                    lines[sp] = (i, line)
+            if value > alphas[sp]:
+                alphas[sp] = value
+        else:
+            if value < best[sp]:
+                best[sp] = value
+                if return_pv:
+                    lines[sp] = (i, line)
+            if value < betas[sp]:
+                betas[sp] = value
+        if prune and betas[sp] <= alphas[sp]:
+            next_child[sp] = len(nodes[sp]['children'])
+        else:
+            next_child[sp] = i + 1
+
+
+def iterative_minimax(node, depth, maximizing_player, return_pv=False):
+    """
+    minimax without recursion; with return_pv returns (value, principal variation)
+    where the principal variation is the list of child indices along the best line.
+    """
+    return _explicit_stack_search(node, depth, float('-inf'), float('inf'), maximizing_player,
+                                  False, return_pv)
+
+
+def iterative_alpha_beta(node, depth, alpha, beta, maximizing_player, return_pv=False):
+    """alpha_beta without recursion; return_pv as for iterative_minimax."""
+    return _explicit_stack_search(node, depth, alpha, beta, maximizing_player, True, return_pv)
+
+
+class TranspositionTable:
+    """LRU-bounded map from (node key, player to move) to (depth, value, flag, best child index)."""
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AlphaBetaSearch:
+    """
+    Alpha-beta search over dict game trees with a transposition table and move ordering.
+
+    Nodes reached again through another path (shared subtrees in a DAG) are looked up in
+    the table instead of searched again, and the best child found for a node is tried
+    first the next time it is searched. iterative_deepening searches depth 1, 2, ...
+    so each iteration is ordered by the best moves of the previous one. The counters
+    nodes, cutoffs and table_hits accumulate over searches (see stats and reset_stats).
+
+    With the default key (node_key), nodes without a 'key' entry are keyed by identity,
+    which only means something within one tree: the table is cleared whenever a search
+    starts from a different root, and that root is kept referenced so no id is reused
+    while its entries are live. To share the table across roots (e.g. successive
+    positions of one game), pass a key function returning stable keys for every node.
+    """
+
+    def __init__(self, table_size=100000, key=node_key, evaluate=static_value):
+        self.table = TranspositionTable(table_size)
+        self.key = key
+        self.evaluate = evaluate
+        self.root = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.table_hits = 0
+
+    @property
+    def stats(self):
+        return {'nodes': self.nodes, 'cutoffs': self.cutoffs, 'table_hits': self.table_hits,
+                'table_size': len(self.table)}
+
+    def search(self, node, depth, alpha=float('-inf'), beta=float('inf'), maximizing_player=True):
+        """Alpha-beta value of node searched to depth plies."""
+        if node is not self.root:
+            if self.key is node_key:
+                self.table.clear()
+            self.root = node
+        return self._search(node, depth, alpha, beta, maximizing_player)
+
+    def _search(self, node, depth, alpha, beta, maximizing_player):
+        self.nodes += 1
+        children = node['children']
+        if depth == 0 or not children:
+            return self.evaluate(node)
+
+        key = (self.key(node), maximizing_player)
+        entry = self.table.get(key)
+        order = range(len(children))
+        if entry is not None:
+            entry_depth, value, flag, best_index = entry
+            if entry_depth == depth and (flag == EXACT or (flag == LOWER and value >= beta)
+                                         or (flag == UPPER and value <= alpha)):
+                self.table_hits += 1
+                return value
+            # Try the previously best child first
+            order = [best_index] + [i for i in range(len(children)) if i != best_index]
+
+        alpha_start, beta_start = alpha, beta
+        best_index = order[0]
+        if maximizing_player:
+            best_value = float('-inf')
+            for i in order:
+                value = self._search(children[i], depth - 1, alpha, beta, False)
+                if value > best_value:
+                    best_value, best_index = value, i
+                alpha = max(alpha, value)
+                if beta <= alpha:
+                    self.cutoffs += 1
+                    break
+        else:
+            best_value = float('inf')
+            for i in order:
+                value = self._search(children[i], depth - 1, alpha, beta, True)
+                if value < best_value:
+                    best_value, best_index = value, i
+                beta = min(beta, value)
+                if beta <= alpha:
+                    self.cutoffs += 1
+                    break
+
+        if best_value <= alpha_start:
+            flag = UPPER
+        elif best_value >= beta_start:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(key, (depth, best_value, flag, best_index))
+        return best_value
+
+    def iterative_deepening(self, node, max_depth, maximizing_player=True):
+        """Search to depth 1, 2, ..., max_depth, reusing the table for ordering; returns the final value."""
+        value = self.evaluate(node)
+        for depth in range(1, max_depth + 1):
+            value = self.search(node, depth, float('-inf'), float('inf'), maximizing_player)
+        return value
+
+    def best_move(self, node, maximizing_player=True):
+        """Index of the best child of node found by the last search, or None."""
+        entry = self.table.get((self.key(node), maximizing_player))
+        return None if entry is None else entry[3]
+
+
+class ArrayTree:
+    """
+    Game tree stored as flat arrays, with nodes numbered in breadth-first order (root = 0).
+
+    - child_offsets (n + 1,): CSR offsets; the children of node i are the nodes
+      child_offsets[i] + 1 ... child_offsets[i + 1], i.e. range(*tree.child_range(i)).
+    - values (n,): float value of every node, NaN where a node has no value.
+    - level_offsets (depth + 2,): the nodes at depth d are level_offsets[d] ... level_offsets[d + 1] - 1.
+
+    Because of the breadth-first numbering the children of a level are exactly the
+    next level, in order, which is what minimax_bottom_up relies on. Arrays may be
+    memory-mapped .npy files (see save and load).
+    """
+    FILES = ('child_offsets', 'values', 'level_offsets')
+
+    def __init__(self, child_offsets, values, level_offsets):
+        self.child_offsets = child_offsets
+        self.values = values
+        self.level_offsets = level_offsets
+
+    def __len__(self):
+        return len(self.values)
+
+    def child_range(self, node):
+        return self.child_offsets[node] + 1, self.child_offsets[node + 1] + 1
+
+    @classmethod
+    def from_dict(cls, tree):
+        """Flatten a dict tree ('value'/'children'); shared subtrees are copied for each parent."""
+        values, counts, level_offsets = [], [], [0]
+        level = [tree]
+        while level:
+            next_level = []
+            for node in level:
+                values.append(np.nan if node['value'] is None else node['value'])
+                counts.append(len(node['children']))
+                next_level.extend(node['children'])
+            level_offsets.append(len(values))
+            level = next_level
+        child_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(child_offsets, np.array(values, dtype=float), np.array(level_offsets, dtype=np.int64))
+
+    def to_dict(self, node=0):
+        """Rebuild the nested dict form (only sensible for small trees)."""
+        value = self.values[node]
+        start, stop = self.child_range(node)
+        return {'value': None if np.isnan(value) else value.item(),
+                'children': [self.to_dict(child) for child in range(start, stop)]}
+
+    @classmethod
+    def complete(cls, depth, branching, rng=None, low=0, high=100, path=None, chunk_size=1 << 22):
+        """
+        Complete tree of the given depth and branching factor with random integer leaf values.
+
+        If path is given the arrays are written there as .npy files and returned
+        memory-mapped, so trees larger than memory can be built.
+        """
+        rng = np.random.default_rng(rng)
+        level_sizes = branching ** np.arange(depth + 1, dtype=np.int64)
+        level_offsets = np.concatenate([[0], np.cumsum(level_sizes)])
+        n, internal = int(level_offsets[-1]), int(level_offsets[-2])
+
+        if path is None:
+            child_offsets = np.empty(n + 1, dtype=np.int64)
+            values = np.empty(n)
+        else:
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, 'level_offsets.npy'), level_offsets)
+            child_offsets = np.lib.format.open_memmap(os.path.join(path, 'child_offsets.npy'),
+                                                      mode='w+', dtype=np.int64, shape=(n + 1,))
+            values = np.lib.format.open_memmap(os.path.join(path, 'values.npy'),
+                                               mode='w+', dtype=float, shape=(n,))
+        for start in range(0, n + 1, chunk_size):
+            nodes = np.arange(start, min(start + chunk_size, n + 1), dtype=np.int64)
+            child_offsets[nodes] = np.minimum(nodes, internal) * branching
+        values[:internal] = np.nan
+        for start in range(internal, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            values[start:stop] = rng.integers(low, high, stop - start)
+        tree = cls(child_offsets, values, level_offsets)
+        if path is not None:
+            tree.flush()
+        return tree
+
+    def save(self, path):
+        """Write the arrays as .npy files into the directory path."""
+        os.makedirs(path, exist_ok=True)
+        for name in self.FILES:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+
+    def flush(self):
+        for name in self.FILES:
+            array = getattr(self, name)
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Load a tree saved with save; arrays are memory-mapped unless mmap_mode is None."""
+        return cls(*(np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in cls.FILES))
+
+
+def array_static_value(tree, node):
+    value = tree.values[node]
+    return 0.0 if np.isnan(value) else value.item()
+
+
+def array_minimax(tree, depth, maximizing_player, node=0):
+    """minimax over an ArrayTree."""
+    start, stop = tree.child_range(node)
+    if depth == 0 or start == stop:
+        return array_static_value(tree, node)
+    values = [array_minimax(tree, depth - 1, not maximizing_player, child) for child in range(start, stop)]
+    return max(values) if maximizing_player else min(values)
+
+
+def array_alpha_beta(tree, depth, alpha, beta, maximizing_player, node=0):
+    """alpha_beta over an ArrayTree."""
+    start, stop = tree.child_range(node)
+    if depth == 0 or start == stop:
+        return array_static_value(tree, node)
+    if maximizing_player:
+        max_eval = float('-inf')
+        for child in range(start, stop):
+            max_eval = max(max_eval, array_alpha_beta(tree, depth - 1, alpha, beta, False, child))
+            alpha = max(alpha, max_eval)
+            if beta <= alpha:
+                break
         return max_eval
-    else :
-        min_eval = float ( 'inf')
-        for child in node [ 'children'] :
-            eval = minimax ( child , depth - 1 , True )
-            min_eval = min ( min_eval , eval )
+    else:
+        min_eval = float('inf')
+        for child in range(start, stop):
+            min_eval = min(min_eval, array_alpha_beta(tree, depth - 1, alpha, beta, True, child))
+            beta = min(beta, min_eval)
+            if beta <= alpha:
+                break
         return min_eval
 
 
-def alpha_beta (node , depth , alpha , beta , maximizing_player) :
-    if depth == 0 or not node [ 'children'] :
-        return node [ 'value']
-    if maximizing_player :
-        max_eval = float ( '-inf')
-        for child in node [ 'children'] :
-            eval = alpha_beta ( child , depth - 1 , alpha , beta , False )
-            max_eval = max ( max_eval , eval )
-            alpha = max ( alpha , eval )
-            if beta <= alpha :
-                break # Beta cut - off
+def minimax_bottom_up(tree, depth, maximizing_player, chunk_size=1 << 22):
+    """
+    Vectorized minimax over an ArrayTree, reducing one level at a time.
+
+    Values at the depth limit (or the last level) are reduced into their parents with
+    np.maximum.reduceat / np.minimum.reduceat, up to the root. Parents are processed
+    in chunks so memory-mapped trees larger than memory work.
+    """
+    level_offsets = np.asarray(tree.level_offsets)
+    last = min(depth, len(level_offsets) - 2)
+    values = np.nan_to_num(np.asarray(tree.values[level_offsets[last]:level_offsets[last + 1]], dtype=float))
+
+    for level in range(last - 1, -1, -1):
+        maximizing = maximizing_player if level % 2 == 0 else not maximizing_player
+        reduce = np.maximum.reduceat if maximizing else np.minimum.reduceat
+        first, end = int(level_offsets[level]), int(level_offsets[level + 1])
+        parents = np.nan_to_num(np.asarray(tree.values[first:end], dtype=float))
+        child_base = int(tree.child_offsets[first])
+        for start in range(0, end - first, chunk_size):
+            stop = min(start + chunk_size, end - first)
+            offsets = np.asarray(tree.child_offsets[first + start:first + stop + 1]) - child_base
+            has_children = offsets[1:] > offsets[:-1]
+            if has_children.any():
+                # Children of consecutive parents are consecutive, so reduceat over the
+                # start offsets of the parents that have children reduces each group
+                lo, hi = offsets[0], offsets[-1]
+                parents[start:stop][has_children] = reduce(values[lo:hi], offsets[:-1][has_children] - lo)
+        values = parents
+    return values[0].item()
+
+
+def counted_alpha_beta(tree, depth, alpha, beta, maximizing_player, node=0, counter=None,
+                       bound=None, root_maximizing=True):
+    """
+    array_alpha_beta that counts visited nodes in counter[0].
+
+    bound is a shared double (e.g. a multiprocessing.Value) holding the best value found so far at the
+    root (an alpha bound if the root maximizes, a beta bound otherwise); it is re-read
+    at every node so subtrees searched in parallel prune against each other's results.
+    """
+    counter[0] += 1
+    if bound is not None:
+        if root_maximizing:
+            alpha = max(alpha, bound.value)
+        else:
+            beta = min(beta, bound.value)
+    start, stop = tree.child_range(node)
+    if depth == 0 or start == stop:
+        return array_static_value(tree, node)
+    if maximizing_player:
+        max_eval = float('-inf')
+        for child in range(start, stop):
+            max_eval = max(max_eval, counted_alpha_beta(tree, depth - 1, alpha, beta, False, child,
+                                                        counter, bound, root_maximizing))
+            alpha = max(alpha, max_eval)
+            if beta <= alpha:
+                break
         return max_eval
-    else :
-        min_eval = float ( 'inf')
-        for child in node [ 'children'] :
-            eval = alpha_beta ( child , depth - 1 , alpha , beta , True )
-            min_eval = min ( min_eval , eval )
-            beta = min ( beta , eval )
-            if beta <= alpha :
-                break # Alpha cut - off
+    else:
+        min_eval = float('inf')
+        for child in range(start, stop):
+            min_eval = min(min_eval, counted_alpha_beta(tree, depth - 1, alpha, beta, True, child,
+                                                        counter, bound, root_maximizing))
+            beta = min(beta, min_eval)
+            if beta <= alpha:
+                break
         return min_eval
 
 
-# Define the game tree
-tree = {
-    'value': None , 'children': [
-        { 'value': None , 'children': [
-            { 'value': 5 , 'children': [ ] } ,
-            { 'value': 3 , 'children': [ ] }
-        ] } ,
-        { 'value': None , 'children': [
-            { 'value': 5 , 'children': [ ] } ,
-            { 'value': 9 , 'children': [ ] }
-        ] },
-        { 'value': None , 'children': [
-            { 'value': 11 , 'children': [ ] } ,
-            { 'value': 9 , 'children': [ ] }
-        ] }
-    ]
-}
-# C a l c u l a t e the optimal value at the root
-print(f"Optimal value at the root : { minimax ( tree , 2 , True ) } " )
-
-print(f"Optimal value at the root with alpha-beta pruning: {alpha_beta(tree, 2, float('-inf'), float('inf'), True)}")
-
-
-import random
+# Per-process state of the parallel search workers, set by _init_search_worker
+_worker_tree = None
+_worker_bound = None
+
+
+def _init_search_worker(tree, bound):
+    global _worker_tree, _worker_bound
+    # A path is loaded memory-mapped in each worker instead of pickling the arrays
+    _worker_tree = ArrayTree.load(tree) if isinstance(tree, str) else tree
+    _worker_bound = bound
+
+
+def _search_root_child(child, depth, root_maximizing):
+    counter = [0]
+    # Read the bound through the raw ctypes object: the synchronized wrapper locks on every read
+    value = counted_alpha_beta(_worker_tree, depth, float('-inf'), float('inf'), not root_maximizing,
+                               child, counter, _worker_bound.get_obj(), root_maximizing)
+    # A value better than the shared bound is exact, so it can tighten the bound for the others
+    with _worker_bound.get_lock():
+        if root_maximizing:
+            _worker_bound.value = max(_worker_bound.value, value)
+        else:
+            _worker_bound.value = min(_worker_bound.value, value)
+    return child, value, counter[0], os.getpid()
+
+
+def parallel_alpha_beta(tree, depth, maximizing_player=True, processes=None):
+    """
+    Alpha-beta over an ArrayTree with the root children split across a process pool.
+
+    Young-brothers-wait: the first (eldest) root child is searched on its own first to
+    get a bound, then the remaining children are searched in parallel against a shared
+    bound that every finished child tightens. tree can be an ArrayTree or the path of
+    a saved one, which each worker then memory-maps. Returns (value, stats) where stats
+    holds the elapsed time, the total node count and the node count per worker pid
+    (the first child is counted under the parent's pid).
+    """
+    start_time = time.perf_counter()
+    local_tree = ArrayTree.load(tree) if isinstance(tree, str) else tree
+    first, stop = local_tree.child_range(0)
+    counter = [0]
+    if depth == 0 or first == stop:
+        value = counted_alpha_beta(local_tree, depth, float('-inf'), float('inf'), maximizing_player, 0, counter)
+        return value, {'elapsed': time.perf_counter() - start_time, 'nodes': counter[0],
+                       'worker_nodes': {os.getpid(): counter[0]}}
+
+    counter[0] += 1  # the root
+    best = counted_alpha_beta(local_tree, depth - 1, float('-inf'), float('inf'), not maximizing_player,
+                              first, counter)
+    worker_nodes = {os.getpid(): counter[0]}
+    bound = multiprocessing.Value('d', best)
+    with ProcessPoolExecutor(processes, initializer=_init_search_worker, initargs=(tree, bound)) as pool:
+        futures = [pool.submit(_search_root_child, child, depth - 1, maximizing_player)
+                   for child in range(first + 1, stop)]
+        for future in as_completed(futures):
+            child, value, nodes, pid = future.result()
+            best = max(best, value) if maximizing_player else min(best, value)
+            worker_nodes[pid] = worker_nodes.get(pid, 0) + nodes
+    return best, {'elapsed': time.perf_counter() - start_time, 'nodes': sum(worker_nodes.values()),
+                  'worker_nodes': worker_nodes}
+
+
+def compare_parallel_alpha_beta(tree, depth, maximizing_player=True, processes=None):
+    """Run the sequential and the parallel search, check they agree and report the speedup and node counts."""
+    local_tree = ArrayTree.load(tree) if isinstance(tree, str) else tree
+    counter = [0]
+    start_time = time.perf_counter()
+    value = counted_alpha_beta(local_tree, depth, float('-inf'), float('inf'), maximizing_player, 0, counter)
+    sequential_time = time.perf_counter() - start_time
+    parallel_value, stats = parallel_alpha_beta(tree, depth, maximizing_player, processes)
+    if parallel_value != value:
+        raise RuntimeError(f"parallel value {parallel_value} differs from sequential value {value}")
+    return {'value': value, 'sequential_time': sequential_time, 'sequential_nodes': counter[0],
+            'parallel_time': stats['elapsed'], 'parallel_nodes': stats['nodes'],
+            'worker_nodes': stats['worker_nodes'], 'speedup': sequential_time / stats['elapsed']}
+
+
+def count_pi_chunk(seed, size):
+    """Number of `size` uniform points in the unit square that fall inside the quarter circle."""
+    rng = np.random.default_rng(seed)
+    x = rng.random(size)
+    y = rng.random(size)
+    return int(np.count_nonzero(x * x + y * y < 1))
+
+
+def iter_pi_estimates(max_samples, chunk_size=1 << 20, seed=None, processes=1):
+    """
+    Monte Carlo estimates of pi, yielded after each chunk of samples.
+
+    Points are drawn in NumPy chunks of at most chunk_size points (so memory does not
+    grow with max_samples), each from its own SeedSequence-spawned stream. With
+    processes != 1 the chunks are drawn in a process pool, a few chunks ahead of the
+    consumer; the results are combined in chunk order, so the estimates depend only on
+    seed and chunk_size. Each yielded dict holds 'samples', 'estimate' and 'stderr',
+    the standard error 4 sqrt(p (1 - p) / n) of the estimate.
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = (min(chunk_size, max_samples - start) for start in range(0, max_samples, chunk_size))
+
+    def in_order(pool):
+        # Keep a few chunks in flight and hand back their counts in submission order
+        ahead = 2 * (processes or os.cpu_count() or 1)
+        pending = deque()
+        for size in sizes:
+            pending.append((size, pool.submit(count_pi_chunk, seed_sequence.spawn(1)[0], size)))
+            if len(pending) >= ahead:
+                size, future = pending.popleft()
+                yield size, future.result()
+        while pending:
+            size, future = pending.popleft()
+            yield size, future.result()
+
+    pool = None if processes == 1 else ProcessPoolExecutor(processes)
+    try:
+        if pool is None:
+            chunks = ((size, count_pi_chunk(seed_sequence.spawn(1)[0], size)) for size in sizes)
+        else:
+            chunks = in_order(pool)
+        inside = samples = 0
+        for size, chunk_inside in chunks:
+            inside += chunk_inside
+            samples += size
+            p = inside / samples
+            yield {'samples': samples, 'estimate': 4 * p, 'stderr': 4 * (p * (1 - p) / samples) ** 0.5}
+    finally:
+        if pool is not None:
+            # Stopping early leaves chunks in flight; drop them
+            pool.shutdown(cancel_futures=True)
+
+
+def estimate_pi(max_samples=10 ** 8, target_stderr=None, chunk_size=1 << 20, seed=None, processes=1,
+                callback=None):
+    """
+    Estimate pi from up to max_samples points, stopping early once the standard error
+    is at most target_stderr. callback, if given, is called with each running estimate.
+    Returns the last running estimate (see iter_pi_estimates).
+    """
+    result = {'samples': 0, 'estimate': np.nan, 'stderr': np.inf}
+    for result in iter_pi_estimates(max_samples, chunk_size, seed, processes):
+        if callback is not None:
+            callback(result)
+        if target_stderr is not None and result['stderr'] <= target_stderr:
+            break
+    return result
+
+
 def count_pi ( n ) :
-    i = 0
-    count = 0
-    while i < n :
-        x = random . random ()
-        y = random . random ()
-        if ( pow (x , 2 ) + pow (y , 2 ) ) < 1 :
-            count += 1
-        i += 1
-    return 4 * ( count / n )
-pi = count_pi ( 10000000 )
-print (pi)
+    return estimate_pi ( n ) [ 'estimate' ]
+
+
+def main():
+    # Define the game tree
+    tree = {
+        'value': None , 'children': [
+            { 'value': None , 'children': [
+                { 'value': 5 , 'children': [ ] } ,
+                { 'value': 3 , 'children': [ ] }
+            ] } ,
+            { 'value': None , 'children': [
+                { 'value': 5 , 'children': [ ] } ,
+                { 'value': 9 , 'children': [ ] }
+            ] },
+            { 'value': None , 'children': [
+                { 'value': 11 , 'children': [ ] } ,
+                { 'value': 9 , 'children': [ ] }
+            ] }
+        ]
+    }
+    # C a l c u l a t e the optimal value at the root
+    print(f"Optimal value at the root : { minimax ( tree , 2 , True ) } " )
+
+    print(f"Optimal value at the root with alpha-beta pruning: {alpha_beta(tree, 2, float('-inf'), float('inf'), True)}")
+
+    pi = count_pi ( 10000000 )
+    print (pi)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Lightweight named timers and counters for the simulation step loops.
+
+Instrumentation is off by default; then phase() hands back a shared no-op context
+manager and count() returns at once, so the hooks left in the models cost about a
+function call each. Turn it on around a run:
+
+    import instrumentation
+    with instrumentation.session(trace=True):
+        world.update_world()
+    print(instrumentation.summary(per="gridworld.update_world"))
+    instrumentation.write_chrome_trace("trace.json")   # open in chrome://tracing or Perfetto
+
+Each phase records its call count, inclusive wall time and the net change in live
+memory blocks while it ran (sys.getallocatedblocks after minus before). That is
+allocations minus frees, not an allocation count: a phase that allocates and frees a
+lot of temporaries shows close to zero, and one that frees more than it allocates
+shows a negative number. Use tracemalloc when the allocation volume itself matters.
+
+An enabled phase itself costs a few microseconds, so phases should wrap more work than
+that: whole steps via @timed on the step method, or large sub-blocks via phase(). Work
+done per agent inside a step is better tracked with count(). Counters are plain totals,
+e.g. calculate_empowerment calls; summary(per=...) divides them by the number of
+calls of a step phase to give counts per step.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_enabled = False
+_tracing = False
+_phases = {}     # name -> [calls, seconds, net live blocks]
+_counters = {}   # name -> total
+_events = []     # Chrome trace events, only collected while tracing
+_depth = 0
+_overhead_blocks = 0   # blocks allocated by the bookkeeping itself, kept out of the phases
+_origin = time.perf_counter()
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('name', 'start', 'blocks', 'overhead')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        global _depth
+        _depth += 1
+        self.overhead = _overhead_blocks
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _depth, _overhead_blocks
+        end = time.perf_counter()
+        now = sys.getallocatedblocks()
+        blocks = now - self.blocks - (_overhead_blocks - self.overhead)
+        _depth -= 1
+        record = _phases.get(self.name)
+        if record is None:
+            record = _phases[self.name] = [0, 0.0, 0]
+        record[0] += 1
+        record[1] += end - self.start
+        record[2] += blocks
+        if _tracing:
+            _events.append({'name': self.name, 'ph': 'X', 'ts': (self.start - _origin) * 1e6,
+                            'dur': (end - self.start) * 1e6, 'pid': os.getpid(),
+                            'tid': threading.get_ident(), 'args': {'net_blocks': blocks}})
+            if _depth == 0 and _counters:
+                # Sample the counters at the end of every top-level phase
+                _events.append({'name': 'counters', 'ph': 'C', 'ts': (end - _origin) * 1e6,
+                                'pid': os.getpid(), 'args': dict(_counters)})
+        _overhead_blocks += sys.getallocatedblocks() - now
+        return False
+
+
+def phase(name):
+    """Context manager timing the enclosed block under name (a no-op while disabled)."""
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def count(name, n=1):
+    """Add n to the counter name (a no-op while disabled)."""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def timed(name=None):
+    """Decorator timing every call of a function as a phase (named after the function by default)."""
+    def decorate(function):
+        label = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Phase(label):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable(trace=False):
+    """Start recording; with trace=True also collect Chrome trace events."""
+    global _enabled, _tracing
+    _enabled = True
+    _tracing = trace
+
+
+def disable():
+    global _enabled, _tracing
+    _enabled = _tracing = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget all recorded phases, counters and trace events."""
+    global _depth, _overhead_blocks, _origin
+    _phases.clear()
+    _counters.clear()
+    _events.clear()
+    _depth = 0
+    _overhead_blocks = 0
+    _origin = time.perf_counter()
+
+
+@contextmanager
+def session(trace=False):
+    """Reset, record the enclosed block, then disable again (the results stay available)."""
+    reset()
+    enable(trace)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats():
+    """Recorded data as {'phases': {name: {'calls', 'seconds', 'net_blocks'}}, 'counters': {...}}."""
+    return {'phases': {name: {'calls': calls, 'seconds': seconds, 'net_blocks': blocks}
+                       for name, (calls, seconds, blocks) in _phases.items()},
+            'counters': dict(_counters)}
+
+
+def summary(per=None):
+    """
+    Table of the phases (sorted by total time) and counters. per names a phase whose
+    call count is the number of steps; counters are then also shown per step. The
+    "net blocks" column is the net change in live blocks, which can be zero or negative.
+    """
+    steps = _phases[per][0] if per in _phases else 0
+    lines = [f"{'phase':<36} {'calls':>9} {'total ms':>11} {'mean us':>10} {'net blocks':>13}"]
+    for name, (calls, seconds, blocks) in sorted(_phases.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<36} {calls:>9} {seconds * 1e3:>11.2f} {seconds / calls * 1e6:>10.1f} {blocks:>13}")
+    if _counters:
+        lines.append("")
+        lines.append(f"{'counter':<36} {'total':>9}" + (f" {'per step':>11}" if steps else ""))
+        for name, total in sorted(_counters.items()):
+            lines.append(f"{name:<36} {total:>9}" + (f" {total / steps:>11.2f}" if steps else ""))
+    return "\n".join(lines)
+
+
+def chrome_trace():
+    """Trace events in the Chrome trace event format (collected with enable(trace=True))."""
+    return {'traceEvents': list(_events), 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(path):
+    with open(path, 'w') as f:
+        json.dump(chrome_trace(), f)
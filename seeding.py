@@ -0,0 +1,57 @@
+"""
+Default random generator for models that are not handed one.
+
+Models take an rng argument (a numpy Generator, a seed or None) and resolve it with
+generator(rng). None gives a shared default stream instead of a new OS-seeded Generator
+per call, which would be slow in per-move policies:
+
+    from seeding import generator
+    rng = generator(rng)
+    choice = moves[rng.integers(len(moves))]
+
+Like the random module, the default stream is reseeded in the child after os.fork, so
+forked workers do not all draw the same numbers. generator(None) returns a proxy that
+always forwards to the current default, so objects that stored it before a fork also
+draw from the child's new stream.
+"""
+import inspect
+import os
+
+import numpy as np
+
+_default_rng = np.random.default_rng()
+
+
+def _reseed_after_fork():
+    global _default_rng
+    _default_rng = np.random.default_rng()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+class _DefaultGenerator:
+    """Forwards every Generator method to the process's current default generator."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(_default_rng, name)
+
+    def __repr__(self):
+        return f"<default generator {_default_rng!r}>"
+
+
+DEFAULT = _DefaultGenerator()
+
+
+def generator(rng=None):
+    """rng as a Generator: the shared default for None, else np.random.default_rng(rng)."""
+    if rng is None or rng is DEFAULT:
+        return DEFAULT
+    return np.random.default_rng(rng)
+
+
+def takes_rng(function):
+    """Whether function declares an rng parameter (policies written before it existed do not)."""
+    return callable(function) and 'rng' in inspect.signature(function).parameters